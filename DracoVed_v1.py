@@ -40,8 +40,10 @@ if __name__ == "__main__":
         console.print("  4. Show planetary transits")
         console.print("  5. Find conjunctions with Sun+Moon + N planets")
         console.print("  6. List New and Full Moons")
+        console.print("  7. Show lagna (ascendant) ingress timeline")
+        console.print("  8. Find transit hits on a natal chart")
         console.print("  0. Exit")
-        choice = input("Enter your choice (0/1/2/3/4/5/6): ").strip()
+        choice = input("Enter your choice (0/1/2/3/4/5/6/7/8): ").strip()
         if choice == "0":
             console.print("[bold green]Goodbye![/bold green]")
             break
@@ -139,5 +141,11 @@ if __name__ == "__main__":
                     console.print("[red]Invalid date format. Please use YYYY-MM-DD.[/red]")
             from features import list_new_full_moons
             list_new_full_moons(start_dt_obj, end_dt_obj, eph, earth, ts)
+        elif choice == "7":
+            from features import show_lagna_timeline
+            show_lagna_timeline(eph, earth, ts)
+        elif choice == "8":
+            from features import show_transit_hits
+            show_transit_hits(eph, earth, ts)
         else:
-            console.print("[red]Invalid choice. Please enter 0, 1, 2, 3, 4, 5, or 6.[/red]")
+            console.print("[red]Invalid choice. Please enter 0, 1, 2, 3, 4, 5, 6, 7, or 8.[/red]")
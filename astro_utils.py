@@ -1,8 +1,10 @@
 # Astronomy and calculation utilities for DracoVed
 from datetime import datetime, timezone
+import numpy as np
 from skyfield.api import load
 import swisseph as swe
-from config import PLANET_SKYFIELD_NAMES, AYANAMSA_SWISSEPH, ZODIAC_SIGNS_SIDEREAL, NAKSHATRAS
+import config
+from config import PLANET_SKYFIELD_NAMES, AYANAMSA_SWISSEPH, ZODIAC_SIGNS_SIDEREAL, NAKSHATRAS, EPHEMERIS_SKYFIELD, EPHEMERIS_PATH_SWISSEPH
 
 # --- Skyfield Setup ---
 ts = load.timescale()
@@ -13,6 +15,15 @@ ts = load.timescale()
 # swe.set_ephe_path(EPHEMERIS_PATH_SWISSEPH) # Set in main script
 # swe.set_sid_mode(AYANAMSA_SWISSEPH) # Set in main script
 
+def load_ephemeris_context(mode='sidereal'):
+    """Load the Skyfield ephemeris and configure pyswisseph; returns (eph, earth, ts)."""
+    config.MODE = mode
+    swe.set_ephe_path(EPHEMERIS_PATH_SWISSEPH)
+    if mode == 'sidereal':
+        swe.set_sid_mode(AYANAMSA_SWISSEPH)
+    eph = load(EPHEMERIS_SKYFIELD)
+    return eph, eph['earth'], ts
+
 def get_skyfield_time(year, month, day, hour=12, minute=0, second=0):
     dt_utc = datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
     return ts.utc(dt_utc)
@@ -70,3 +81,18 @@ def get_nakshatra_and_pada(sidereal_long):
     nak_num = int(sidereal_long // (360/27))
     pada_num = int((sidereal_long % (360/27)) // (360/27/4)) + 1
     return (NAKSHATRAS[nak_num], pada_num)
+
+def get_planet_longitudes(planet, t_sky, eph, earth, sidereal_mode):
+    """Longitudes of one body for every instant of a vector Skyfield Time."""
+    jd_ut = np.atleast_1d(get_julian_day_from_skyfield_time(t_sky))
+    if planet in PLANET_SKYFIELD_NAMES:
+        astrometric = earth.at(t_sky).observe(eph[PLANET_SKYFIELD_NAMES[planet]])
+        eclat, eclon, _ = astrometric.ecliptic_latlon(epoch='date')
+        lons = np.atleast_1d(eclon.degrees)
+    else:
+        lons = np.array([swe.calc_ut(jd, swe.TRUE_NODE, 0)[0][0] for jd in jd_ut])
+        if planet == "Ketu":
+            lons = lons + 180.0
+    if sidereal_mode:
+        lons = lons - np.array([swe.get_ayanamsa_ut(jd) for jd in jd_ut])
+    return lons % 360.0
@@ -9,6 +9,11 @@ EPHEMERIS_PATH_SWISSEPH = SCRIPT_DIRECTORY # .se1 files MUST be here
 
 # Calculation mode: 'sidereal' for Vedic, 'tropical' for Western
 MODE = 'sidereal'
+
+# Position backend for sign-level searches (ingress index, conjunctions,
+# transit hits): 'skyfield' or 'swisseph'. Run position_backends.py to
+# compare their accuracy and speed on this machine.
+SEARCH_POSITION_BACKEND = 'skyfield'
 
 PLANET_SKYFIELD_NAMES = {
     "Sun": 'sun',
@@ -19,6 +24,17 @@ PLANET_SKYFIELD_NAMES = {
     "Jupiter": 'jupiter barycenter',
     "Saturn": 'saturn barycenter'
 }
+
+SWISSEPH_PLANET_IDS = {
+    "Sun": swe.SUN,
+    "Moon": swe.MOON,
+    "Mercury": swe.MERCURY,
+    "Venus": swe.VENUS,
+    "Mars": swe.MARS,
+    "Jupiter": swe.JUPITER,
+    "Saturn": swe.SATURN,
+    "Rahu": swe.TRUE_NODE
+}
 
 ZODIAC_SIGNS_SIDEREAL = [
     "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
@@ -36,9 +52,24 @@ AYANAMSA_SWISSEPH = swe.SIDM_TRUE_CITRA # Changed to True Chitrapaksha
 MIN_CONJUNCTING_PLANETS = 4
 START_YEAR = 2017
 END_YEAR = 2050
+
+# Rows per page in the paged result viewer
+RESULT_PAGE_SIZE = 20
 
 NAKSHATRAS = [
     "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashirsha", "Ardra", "Punarvasu", "Pushya", "Ashlesha",
     "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
     "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
 ]
+
+# Vimshottari dasha lords in sequence (Ashwini starts with Ketu) and their periods in years
+VIMSHOTTARI_LORDS = [
+    "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"
+]
+VIMSHOTTARI_YEARS = [7, 20, 6, 10, 7, 18, 16, 19, 17]
+DASHA_YEAR_DAYS = 365.25
+
+# Precomputed sign/nakshatra/pada ingress index (built with `python ingress_index.py`)
+INGRESS_INDEX_DIRECTORY = os.path.join(SCRIPT_DIRECTORY, 'ingress_index')
+INGRESS_INDEX_START_YEAR = 1800
+INGRESS_INDEX_END_YEAR = 2200
@@ -0,0 +1,107 @@
+# Vimshottari dasha engine for DracoVed
+#
+# Mahadashas and antardashas are built eagerly as small arrays; deeper levels
+# (pratyantar, sookshma, prana) are expanded only when asked for. Every level
+# divides its parent in the same 7:20:6:10:7:18:16:19:17 proportions starting
+# from the parent's own lord, so one rotated cumulative table serves them all.
+import numpy as np
+from config import VIMSHOTTARI_YEARS, DASHA_YEAR_DAYS
+
+NAKSHATRA_SPAN = 360.0 / 27
+DASHA_LEVEL_NAMES = ["Mahadasha", "Antardasha", "Pratyantar", "Sookshma", "Prana"]
+
+_YEARS = np.array(VIMSHOTTARI_YEARS, dtype=float)
+_TOTAL_YEARS = _YEARS.sum()
+# _ROT_LORDS[L] is the lord sequence starting from L, _ROT_CUM[L] its cumulative
+# share of the parent period (0 .. 1, ten edges for nine periods).
+_ROT_LORDS = np.array([[(lord + j) % 9 for j in range(9)] for lord in range(9)], dtype=np.int8)
+_ROT_CUM = np.concatenate([np.zeros((9, 1)), np.cumsum(_YEARS[_ROT_LORDS], axis=1) / _TOTAL_YEARS], axis=1)
+
+
+def get_dasha_balance(moon_lon):
+    """Return (lord index, elapsed fraction) of the dasha running at birth."""
+    nak_pos = moon_lon / NAKSHATRA_SPAN
+    nak_num = int(nak_pos) % 27
+    return nak_num % 9, nak_pos - int(nak_pos)
+
+
+def expand_dasha_period(start_jd, end_jd, lord):
+    """Split one period into its nine sub-periods as (starts, ends, lords) arrays."""
+    edges = start_jd + _ROT_CUM[lord] * (end_jd - start_jd)
+    return edges[:-1], edges[1:], _ROT_LORDS[lord]
+
+
+def compute_vimshottari_dasha(moon_lon, birth_jd):
+    """Build the 120-year Vimshottari timeline for one chart.
+
+    Mahadashas ("md_*", shape (9,)) and antardashas ("ad_*", shape (9, 9)) are
+    stored as Julian day and lord index arrays. The first mahadasha starts
+    before birth; "balance_years" is what remains of it at birth.
+    """
+    lord, elapsed = get_dasha_balance(moon_lon)
+    span = _TOTAL_YEARS * DASHA_YEAR_DAYS
+    cycle_start = birth_jd - elapsed * _YEARS[lord] * DASHA_YEAR_DAYS
+    md_starts, md_ends, md_lords = expand_dasha_period(cycle_start, cycle_start + span, lord)
+    ad_edges = md_starts[:, None] + _ROT_CUM[md_lords] * (md_ends - md_starts)[:, None]
+    return {
+        "birth_jd": birth_jd,
+        "balance_years": (1.0 - elapsed) * _YEARS[lord],
+        "md_starts": md_starts,
+        "md_ends": md_ends,
+        "md_lords": md_lords,
+        "ad_starts": ad_edges[:, :-1],
+        "ad_ends": ad_edges[:, 1:],
+        "ad_lords": _ROT_LORDS[md_lords],
+    }
+
+
+def get_dasha_sub_periods(dasha, path):
+    """Lazily expand the period addressed by path, e.g. (md, ad) for pratyantars.
+
+    path holds one index per level; the returned arrays are the nine children
+    of the addressed period.
+    """
+    if len(path) == 0:
+        return dasha["md_starts"], dasha["md_ends"], dasha["md_lords"]
+    md = path[0]
+    if len(path) == 1:
+        return dasha["ad_starts"][md], dasha["ad_ends"][md], dasha["ad_lords"][md]
+    ad = path[1]
+    start, end, lord = dasha["ad_starts"][md, ad], dasha["ad_ends"][md, ad], dasha["ad_lords"][md, ad]
+    for i in path[2:]:
+        starts, ends, lords = expand_dasha_period(start, end, lord)
+        start, end, lord = starts[i], ends[i], lords[i]
+    return expand_dasha_period(start, end, lord)
+
+
+def find_current_dashas(moon_lons, birth_jds, at_jds, depth=3):
+    """Running dasha lords for a cohort of charts in one vectorized pass.
+
+    All inputs broadcast to shape (N,). Returns (lords, starts, ends), each of
+    shape (N, depth); lords index VIMSHOTTARI_LORDS.
+    """
+    moon_lons, birth_jds, at_jds = np.broadcast_arrays(
+        np.asarray(moon_lons, dtype=float), np.asarray(birth_jds, dtype=float), np.asarray(at_jds, dtype=float))
+    nak_pos = moon_lons / NAKSHATRA_SPAN
+    lord = (np.floor(nak_pos).astype(np.int64) % 27) % 9
+    span = _TOTAL_YEARS * DASHA_YEAR_DAYS
+    cycle_start = birth_jds - (nak_pos - np.floor(nak_pos)) * _YEARS[lord] * DASHA_YEAR_DAYS
+    # Whole 120-year cycles before the query date are skipped; the sequence repeats.
+    start = cycle_start + np.floor((at_jds - cycle_start) / span) * span
+    length = np.full(moon_lons.shape, span)
+    lords = np.empty(moon_lons.shape + (depth,), dtype=np.int8)
+    starts = np.empty(moon_lons.shape + (depth,))
+    ends = np.empty(moon_lons.shape + (depth,))
+    for level in range(depth):
+        cum = _ROT_CUM[lord]
+        frac = (at_jds - start) / length
+        j = np.clip((cum[..., 1:] <= frac[..., None]).sum(axis=-1), 0, 8)[..., None]
+        sub_start = start + np.take_along_axis(cum, j, axis=-1)[..., 0] * length
+        sub_end = start + np.take_along_axis(cum, j + 1, axis=-1)[..., 0] * length
+        j = j[..., 0]
+        lord = _ROT_LORDS[lord, j]
+        lords[..., level] = lord
+        starts[..., level] = sub_start
+        ends[..., level] = sub_end
+        start, length = sub_start, sub_end - sub_start
+    return lords, starts, ends
@@ -3,13 +3,106 @@ from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
+from bisect import bisect_left
+from datetime import datetime
+from config import RESULT_PAGE_SIZE
 
 console = Console()
 
-def print_rich_table(headers, rows, title=None):
+def build_rich_table(headers, rows, title=None):
     table = Table(title=title, show_lines=True, header_style="bold magenta")
     for h in headers:
         table.add_column(h, style="bold cyan")
     for row in rows:
         table.add_row(*[str(x) for x in row])
-    console.print(table)
+    return table
+
+def print_rich_table(headers, rows, title=None):
+    console.print(build_rich_table(headers, rows, title))
+
+# --- Paged result viewer ---
+# Only the rows of the current page are formatted and rendered, so large
+# result sets cost the same to display as small ones.
+
+PAGER_HELP = "[dim]Enter/n: next  p: previous  g YYYY-MM-DD: jump to date  f <sign|body>: filter  f: clear filter  q: quit[/dim]"
+
+def show_paged_table(headers, total, get_rows, title=None, find_row=None, filter_rows=None, page_size=RESULT_PAGE_SIZE):
+    """Browse total result rows page by page.
+
+    get_rows(indices) formats the given row indices. find_row(datetime) returns
+    the first row index at or after a date and filter_rows(term) the sorted
+    indices of rows matching a sign or body name (None if the term is unknown);
+    either may be omitted to disable that command.
+    """
+    if total <= page_size:
+        print_rich_table(headers, get_rows(range(total)), title)
+        return
+    view, label, start = range(total), "", 0
+    redraw = True
+    while True:
+        stop = min(start + page_size, len(view))
+        if redraw:
+            page_title = f"{title or 'Results'}{label} – rows {start + 1}-{stop} of {len(view)}"
+            print_rich_table(headers, get_rows(view[start:stop]), page_title)
+            console.print(PAGER_HELP)
+        redraw = True
+        cmd = input("> ").strip()
+        if cmd in ("", "n"):
+            if stop >= len(view):
+                console.print("[yellow]Already at the last page.[/yellow]")
+                redraw = False
+            else:
+                start = stop
+        elif cmd == "p":
+            start = max(start - page_size, 0)
+        elif cmd == "q":
+            return
+        elif cmd.startswith("g") and find_row:
+            try:
+                row = find_row(datetime.strptime(cmd[1:].strip(), "%Y-%m-%d"))
+            except ValueError:
+                console.print("[red]Use g YYYY-MM-DD.[/red]")
+                redraw = False
+                continue
+            start = min(bisect_left(view, row), max(len(view) - 1, 0))
+        elif cmd.startswith("f") and filter_rows:
+            term = cmd[1:].strip()
+            if not term:
+                view, label, start = range(total), "", 0
+                continue
+            rows = filter_rows(term)
+            if rows is None:
+                console.print(f"[red]Unknown sign or body: {term}[/red]")
+                redraw = False
+            elif len(rows) == 0:
+                console.print(f"[yellow]No rows match {term}.[/yellow]")
+                redraw = False
+            else:
+                view, label, start = rows, f" ({term})", 0
+        else:
+            console.print("[red]Unknown command.[/red]")
+            redraw = False
+
+def show_paged_sections(labels, render_section):
+    """Show one section (e.g. a month's table) at a time; render_section(i) builds it on demand."""
+    if len(labels) <= 1:
+        for i in range(len(labels)):
+            console.print(render_section(i))
+        return
+    i = 0
+    while True:
+        console.print(render_section(i))
+        console.print(f"[dim]{i + 1}/{len(labels)}  Enter/n: next  p: previous  number: jump to that section ({', '.join(f'{k + 1}={label}' for k, label in enumerate(labels))})  q: quit[/dim]")
+        cmd = input("> ").strip()
+        if cmd in ("", "n"):
+            if i + 1 >= len(labels):
+                return
+            i += 1
+        elif cmd == "p":
+            i = max(i - 1, 0)
+        elif cmd == "q":
+            return
+        elif cmd.isdigit() and 1 <= int(cmd) <= len(labels):
+            i = int(cmd) - 1
+        else:
+            console.print("[red]Unknown command.[/red]")
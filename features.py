@@ -1,19 +1,171 @@
 # Main features for DracoVed: conjunctions and D1 chart
 from datetime import datetime, timedelta, timezone
-from collections import defaultdict
 from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
 from rich.panel import Panel
 from rich.text import Text
 from geopy.geocoders import Nominatim
 import config
 from config import PLANET_SKYFIELD_NAMES, ZODIAC_SIGNS_SIDEREAL, ALL_PLANETS, AYANAMSA_SWISSEPH, NAKSHATRAS, EPHEMERIS_PATH_SWISSEPH
-from display_utils import console, print_rich_table
+from display_utils import console, print_rich_table, show_paged_table, show_paged_sections
 from astro_utils import *
 import swisseph as swe
 from rich.table import Table
+import numpy as np
+from ingress_index import get_ingress_index
+from position_backends import get_position_backend
+from time_grid import TimeGrid
 
 # The following functions require eph, earth, ts to be passed in from main
 
+def _indexed_daily_signs(grid, planets):
+    # Sign of each planet on each grid day, looked up in the ingress index;
+    # None when no index covers the range.
+    index = get_ingress_index()
+    if index is None or len(grid) == 0 or not index.covers(grid.ut1[0], grid.ut1[-1]):
+        return None
+    return np.stack([index.buckets_at(p, grid.ut1) for p in planets], axis=1)
+
+
+def _daily_signs(grid, planets, backend):
+    # Signs on every grid day from the ingress index, or else from positions
+    # computed in one vectorized call per body. Also returns those positions
+    # as a (days, ALL_PLANETS) array, or None when the index answered.
+    signs = _indexed_daily_signs(grid, planets)
+    if signs is not None:
+        return signs, None
+    lons = np.full((len(grid), len(ALL_PLANETS)), np.nan)
+    if len(grid):
+        for p in planets:
+            lons[:, ALL_PLANETS.index(p)] = backend.grid_longitudes(p, grid)
+    return (lons[:, [ALL_PLANETS.index(p) for p in planets]] // 30.0).astype(np.intp) % 12, lons
+
+
+def _grid_ayanamsas(jd_ut):
+    # Ayanamsa per day (0 in tropical mode) and how many days precede the
+    # first day it could not be computed.
+    values = np.zeros(len(jd_ut))
+    if config.MODE != 'sidereal':
+        return values, len(jd_ut)
+    for i in range(len(jd_ut)):
+        ayanamsa = get_ayanamsa_value(jd_ut[i])
+        if ayanamsa is None:
+            return values[:i], i
+        values[i] = ayanamsa
+    return values, len(jd_ut)
+
+
+def _conjunction_columns(days, signs, masks, ayanamsas, lons):
+    return {
+        "day": np.asarray(days, dtype=np.int32),
+        "sign": np.asarray(signs, dtype=np.int8),
+        "bodies": np.asarray(masks, dtype=np.uint16),
+        "ayanamsa": np.asarray(ayanamsas, dtype=np.float32),
+        "lon": np.asarray(lons, dtype=np.float32).reshape(-1, len(ALL_PLANETS)),
+    }
+
+
+def _conjunction_runs(signs, planets, min_planets, require_sun_moon):
+    # (days, 12) body bitmask per sign; a row is reported on the first day of
+    # each unbroken run of the same sign holding the same bodies.
+    total_days = len(signs)
+    bits = np.array([1 << ALL_PLANETS.index(p) for p in planets], dtype=np.int64)
+    masks = np.zeros((total_days, 12), dtype=np.int64)
+    counts = np.zeros((total_days, 12), dtype=np.int64)
+    for b in range(len(planets)):
+        masks[np.arange(total_days), signs[:, b]] |= bits[b]
+        counts[np.arange(total_days), signs[:, b]] += 1
+    qualifies = counts >= min_planets
+    if require_sun_moon:
+        pair = bits[planets.index("Sun")] | bits[planets.index("Moon")]
+        qualifies &= (masks & pair) == pair
+    repeated = np.zeros_like(qualifies)
+    repeated[1:] = qualifies[:-1] & (masks[1:] == masks[:-1])
+    days, sign_idx = np.nonzero(qualifies & ~repeated)
+    # Within a day, signs are listed in the order their first planet appears
+    first_planet = np.argmax(signs[days] == sign_idx[:, None], axis=1)
+    order = np.lexsort((first_planet, days))
+    days, sign_idx = days[order], sign_idx[order]
+    return days, sign_idx, masks[days, sign_idx]
+
+
+def search_conjunctions(start_date_dt, end_date_dt, min_planets, eph, earth, ts, require_sun_moon=False, include_nodes=True, advance=None):
+    """Scan day by day for signs holding at least min_planets bodies.
+
+    Returns (results, halted). results holds parallel columns with one row
+    per first day of an unbroken run: "day" (date ordinal), "sign", "bodies"
+    (bitmask over ALL_PLANETS), "ayanamsa" and "lon" (rows x ALL_PLANETS,
+    NaN for bodies not in the conjunction). halted is True when the
+    Ayanamsha stopped being computable part way through.
+    """
+    planets = list(PLANET_SKYFIELD_NAMES) + (["Rahu", "Ketu"] if include_nodes else [])
+    grid = TimeGrid.for_range(ts, start_date_dt, end_date_dt)
+    backend = get_position_backend(eph, earth, ts)
+    signs, day_lons = _daily_signs(grid, planets, backend)
+    days, sign_idx, row_masks = _conjunction_runs(signs, planets, min_planets, require_sun_moon)
+    # Ayanamsa and positions are only needed on the days that produced a row
+    hit_days, row_day = np.unique(days, return_inverse=True)
+    ayanamsas, valid = _grid_ayanamsas(grid.ut1[hit_days])
+    if day_lons is not None:
+        lons = day_lons[hit_days[:valid]]
+    else:
+        lons = np.full((valid, len(ALL_PLANETS)), np.nan)
+        if valid:
+            for p in planets:
+                lons[:, ALL_PLANETS.index(p)] = backend.grid_longitudes(p, grid, hit_days[:valid])
+    keep = row_day < valid
+    row_day, row_masks = row_day[keep], row_masks[keep]
+    member = (row_masks[:, None] >> np.arange(len(ALL_PLANETS))) & 1 == 1
+    results = _conjunction_columns(grid.ordinal[days[keep]], sign_idx[keep], row_masks,
+                                   ayanamsas[row_day], np.where(member, lons[row_day], np.nan))
+    halted = valid < len(hit_days)
+    if advance and not halted:
+        advance(len(grid))
+    return results, halted
+
+
+def conjunction_bodies(mask):
+    """Names of the bodies set in an ALL_PLANETS bitmask, alphabetically."""
+    return sorted(p for b, p in enumerate(ALL_PLANETS) if mask >> b & 1)
+
+
+def format_conjunction_rows(results, indices=None):
+    """Format the given rows (all by default) of search_conjunctions results for display."""
+    rows = []
+    for i in range(len(results["day"])) if indices is None else indices:
+        details = []
+        bodies = conjunction_bodies(int(results["bodies"][i]))
+        for p in bodies:
+            deg = float(results["lon"][i, ALL_PLANETS.index(p)])
+            deg_str = format_degree_in_sign(deg)
+            nak, pada = get_nakshatra_and_pada(deg)
+            details.append(f"[bold yellow]{p}[/bold yellow] ([cyan]{deg_str}°[/cyan] {nak}-{pada})")
+        rows.append([
+            datetime.fromordinal(int(results["day"][i])).strftime('%Y-%m-%d'),
+            ZODIAC_SIGNS_SIDEREAL[results["sign"][i]],
+            f"{results['ayanamsa'][i]:.4f}",
+            len(bodies),
+            "\n".join(details)
+        ])
+    return rows
+
+
+def filter_result_rows(results, term):
+    """Indices of result rows in a sign or, for conjunctions, holding a body; None if term is neither."""
+    term = term.capitalize()
+    if term in ZODIAC_SIGNS_SIDEREAL:
+        return np.nonzero(results["sign"] == ZODIAC_SIGNS_SIDEREAL.index(term))[0]
+    if term in ALL_PLANETS and "bodies" in results:
+        return np.nonzero(results["bodies"] & (1 << ALL_PLANETS.index(term)))[0]
+    return None
+
+
+def show_result_pages(headers, results, get_rows, title=None):
+    """Page through columnar search results, formatting only the rows on screen."""
+    show_paged_table(headers, len(results["day"]), get_rows, title=title,
+                     find_row=lambda dt: int(np.searchsorted(results["day"], dt.toordinal())),
+                     filter_rows=lambda term: filter_result_rows(results, term))
+
+
 def find_conjunctions(start_date_dt, end_date_dt, min_planets, eph, earth, ts):
     sidereal_mode = (config.MODE == 'sidereal')
     ayanamsa_name_str = "True Chitrapaksha" if AYANAMSA_SWISSEPH == swe.SIDM_TRUE_CITRA else \
@@ -24,7 +176,7 @@ def find_conjunctions(start_date_dt, end_date_dt, min_planets, eph, earth, ts):
     total_days = (end_date_dt - start_date_dt).days + 1
     config_table = [
         ["Time Range", f"{start_date_dt.strftime('%Y-%m-%d')} to {end_date_dt.strftime('%Y-%m-%d')}`"],
-        ["Ephemeris", "Skyfield (Sun-Saturn), pyswisseph (Rahu)"],
+        ["Ephemeris", get_position_backend(eph, earth, ts).label],
         ["Ayanamsha", ayanamsa_name_str],
         ["SE1 Path", EPHEMERIS_PATH_SWISSEPH],  # Use config value instead of swe.get_ephe_path()
         ["Min Planets", str(min_planets)]
@@ -33,8 +185,6 @@ def find_conjunctions(start_date_dt, end_date_dt, min_planets, eph, earth, ts):
     console.print(Panel.fit(f"[bold magenta]{title_txt}[/bold magenta]", style="cyan"))
     print_rich_table(["Parameter", "Value"], config_table)
     current_date = start_date_dt
-    found_conjunctions = {}
-    pyswisseph_functional_for_ayanamsa = True
     pyswisseph_functional_for_rahu = True
     t_sky_initial_check = get_skyfield_time(current_date.year, current_date.month, current_date.day)
     jd_ut_initial_check = get_julian_day_from_skyfield_time(t_sky_initial_check)
@@ -50,7 +200,6 @@ def find_conjunctions(start_date_dt, end_date_dt, min_planets, eph, earth, ts):
         console.print(f"Ensure Swiss Ephemeris .se1 files (for nodes) are in: {swe.get_ephe_path()}")
         console.print("Continuing search, but Rahu will be excluded if this persists.")
         pyswisseph_functional_for_rahu = False
-    found_conjunctions_list = []
     with Progress(
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
@@ -60,77 +209,17 @@ def find_conjunctions(start_date_dt, end_date_dt, min_planets, eph, earth, ts):
         console=console,
     ) as progress:
         task = progress.add_task("Calculating", total=total_days)
-        while current_date <= end_date_dt:
-            t_sky = get_skyfield_time(current_date.year, current_date.month, current_date.day)
-            jd_ut = get_julian_day_from_skyfield_time(t_sky)
-            ayanamsa = 0
-            if sidereal_mode and pyswisseph_functional_for_ayanamsa:
-                ayanamsa = get_ayanamsa_value(jd_ut)
-                if ayanamsa is None:
-                    pyswisseph_functional_for_ayanamsa = False
-            planet_positions_in_signs = defaultdict(list)
-            planet_degrees = {}
-            if (not sidereal_mode) or pyswisseph_functional_for_ayanamsa:
-                for display_name, skyfield_name in PLANET_SKYFIELD_NAMES.items():
-                    tropical_lon = get_tropical_ecliptic_longitude_skyfield(t_sky, skyfield_name, eph, earth)
-                    if tropical_lon is not None:
-                        lon = get_sidereal_longitude(tropical_lon, ayanamsa) if sidereal_mode else tropical_lon
-                        if lon is not None:
-                            sign_index = get_zodiac_sign_index(lon)
-                            if sign_index is not None:
-                                planet_positions_in_signs[sign_index].append(display_name)
-                                planet_degrees[display_name] = lon
-                # Rahu
-                if pyswisseph_functional_for_rahu:
-                    rahu_tropical_lon = get_rahu_tropical_longitude_swisseph(jd_ut)
-                    if rahu_tropical_lon is not None:
-                        rahu_lon = get_sidereal_longitude(rahu_tropical_lon, ayanamsa) if sidereal_mode else rahu_tropical_lon
-                        if rahu_lon is not None:
-                            rahu_sign_index = get_zodiac_sign_index(rahu_lon)
-                            if rahu_sign_index is not None:
-                                planet_positions_in_signs[rahu_sign_index].append("Rahu")
-                                planet_degrees["Rahu"] = rahu_lon
-                # Ketu
-                if pyswisseph_functional_for_rahu:
-                    rahu_tropical_lon = get_rahu_tropical_longitude_swisseph(jd_ut)
-                    if rahu_tropical_lon is not None:
-                        ketu_tropical_lon = (rahu_tropical_lon + 180.0) % 360.0
-                        ketu_lon = get_sidereal_longitude(ketu_tropical_lon, ayanamsa) if sidereal_mode else ketu_tropical_lon
-                        if ketu_lon is not None:
-                            ketu_sign_index = get_zodiac_sign_index(ketu_lon)
-                            if ketu_sign_index is not None:
-                                planet_positions_in_signs[ketu_sign_index].append("Ketu")
-                                planet_degrees["Ketu"] = ketu_lon
-            for sign_index, planets_in_sign in planet_positions_in_signs.items():
-                if len(planets_in_sign) >= min_planets:
-                    sign_name = ZODIAC_SIGNS_SIDEREAL[sign_index]
-                    details = []
-                    for p in sorted(planets_in_sign):
-                        deg = planet_degrees.get(p, None)
-                        deg_str = format_degree_in_sign(deg)
-                        nak, pada = get_nakshatra_and_pada(deg)
-                        details.append(f"[bold yellow]{p}[/bold yellow] ([cyan]{deg_str}°[/cyan] {nak}-{pada})")
-                    planets_str = "\n".join(details)
-                    conjunction_key = (sign_name, tuple(sorted(planets_in_sign)))
-                    if conjunction_key not in found_conjunctions or \
-                       found_conjunctions[conjunction_key] != current_date - timedelta(days=1):
-                        ayanamsa_str = f"{ayanamsa:.4f}" if ayanamsa is not None else "N/A"
-                        found_conjunctions_list.append([
-                            current_date.strftime('%Y-%m-%d'),
-                            sign_name,
-                            ayanamsa_str,
-                            len(planets_in_sign),
-                            planets_str
-                        ])
-                    found_conjunctions[conjunction_key] = current_date
-            if sidereal_mode and not pyswisseph_functional_for_ayanamsa:
-                console.print("[bold red]Halting search as Ayanamsha calculation is no longer functional (pyswisseph issue).")
-                return
-            current_date += timedelta(days=1)
-            progress.update(task, advance=1)
-    if found_conjunctions_list:
+        found_conjunctions_list, halted = search_conjunctions(
+            start_date_dt, end_date_dt, min_planets, eph, earth, ts,
+            include_nodes=pyswisseph_functional_for_rahu,
+            advance=lambda n=1: progress.update(task, advance=n))
+    if halted:
+        console.print("[bold red]Halting search as Ayanamsha calculation is no longer functional (pyswisseph issue).")
+        return
+    if len(found_conjunctions_list["day"]):
         console.print(Panel.fit("[bold green]═══ CONJUNCTION SEARCH RESULTS ═══[/bold green]", style="green"))
-        print_rich_table(["Date", "Sign", "Ayanamsha", "# Planets", "Planets (Deg, Nakshatra-Pada)"], found_conjunctions_list)
+        show_result_pages(["Date", "Sign", "Ayanamsha", "# Planets", "Planets (Deg, Nakshatra-Pada)"], found_conjunctions_list,
+                          lambda indices: format_conjunction_rows(found_conjunctions_list, indices), title="Conjunctions")
     else:
         console.print("[yellow]No conjunctions found meeting the criteria.")
     console.print("[bold green]Search complete.[/bold green]")
@@ -166,12 +255,57 @@ def list_new_full_moons(start_date_dt, end_date_dt, eph, earth, ts):
         console.print("[yellow]No lunar phase events found in range.")
 
 
+def search_pair_conjunctions(start_date_dt, end_date_dt, planet1, planet2, eph, earth, ts, advance=None):
+    """Find every day both bodies share a sign.
+
+    Returns parallel columns "day" (date ordinal), "sign", "lon1" and "lon2".
+    """
+    grid = TimeGrid.for_range(ts, start_date_dt, end_date_dt)
+    backend = get_position_backend(eph, earth, ts)
+    signs = _indexed_daily_signs(grid, [planet1, planet2])
+    if signs is not None:
+        # Only the days the index puts both bodies in one sign need positions
+        hit_days = np.nonzero(signs[:, 0] == signs[:, 1])[0]
+    else:
+        hit_days = np.arange(len(grid))
+    lon1 = lon2 = np.zeros(0)
+    if len(hit_days):
+        lon1 = backend.grid_longitudes(planet1, grid, hit_days)
+        lon2 = backend.grid_longitudes(planet2, grid, hit_days)
+    same = (lon1 // 30.0) == (lon2 // 30.0)
+    if advance:
+        advance(len(grid))
+    return _pair_columns(grid.ordinal[hit_days[same]], lon1[same] // 30.0, lon1[same], lon2[same])
+
+
+def _pair_columns(days, signs, lon1, lon2):
+    return {
+        "day": np.asarray(days, dtype=np.int32),
+        "sign": np.asarray(signs, dtype=np.int8),
+        "lon1": np.asarray(lon1, dtype=np.float32),
+        "lon2": np.asarray(lon2, dtype=np.float32),
+    }
+
+
+def format_pair_rows(results, planet1, planet2, indices=None):
+    """Format the given rows (all by default) of search_pair_conjunctions results for display."""
+    rows = []
+    for i in range(len(results["day"])) if indices is None else indices:
+        lon1, lon2 = float(results["lon1"][i]), float(results["lon2"][i])
+        n1, p1 = get_nakshatra_and_pada(lon1)
+        n2, p2 = get_nakshatra_and_pada(lon2)
+        rows.append([
+            datetime.fromordinal(int(results["day"][i])).strftime('%Y-%m-%d'),
+            ZODIAC_SIGNS_SIDEREAL[results["sign"][i]],
+            f"[bold yellow]{planet1}[/bold yellow] ([cyan]{format_degree_in_sign(lon1)}°[/cyan] {n1}-{p1})",
+            f"[bold yellow]{planet2}[/bold yellow] ([cyan]{format_degree_in_sign(lon2)}°[/cyan] {n2}-{p2})"
+        ])
+    return rows
+
+
 def find_pair_conjunctions(start_date_dt, end_date_dt, planet1, planet2, eph, earth, ts):
-    sidereal_mode = (config.MODE == 'sidereal')
     console.print(Panel.fit(f"[bold cyan]Searching for conjunctions between {planet1} and {planet2} from {start_date_dt.year} to {end_date_dt.year}[/bold cyan]", style="cyan"))
     total_days = (end_date_dt - start_date_dt).days + 1
-    conjunction_dates = []
-    current_date = start_date_dt
     with Progress(
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
@@ -181,48 +315,12 @@ def find_pair_conjunctions(start_date_dt, end_date_dt, planet1, planet2, eph, ea
         console=console,
     ) as progress:
         task = progress.add_task("Calculating", total=total_days)
-        while current_date <= end_date_dt:
-            t_sky = get_skyfield_time(current_date.year, current_date.month, current_date.day)
-            jd_ut = get_julian_day_from_skyfield_time(t_sky)
-            ayanamsa = get_ayanamsa_value(jd_ut) if sidereal_mode else 0
-            positions = {}
-            nakshatras = {}
-            for p in [planet1, planet2]:
-                if p in PLANET_SKYFIELD_NAMES:
-                    tropical_lon = get_tropical_ecliptic_longitude_skyfield(t_sky, PLANET_SKYFIELD_NAMES[p], eph, earth)
-                elif p == "Rahu":
-                    tropical_lon = get_rahu_tropical_longitude_swisseph(jd_ut)
-                elif p == "Ketu":
-                    rahu_lon = get_rahu_tropical_longitude_swisseph(jd_ut)
-                    tropical_lon = (rahu_lon + 180.0) % 360.0 if rahu_lon is not None else None
-                else:
-                    tropical_lon = None
-                if tropical_lon is not None and (not sidereal_mode or ayanamsa is not None):
-                    lon = get_sidereal_longitude(tropical_lon, ayanamsa) if sidereal_mode else tropical_lon
-                    positions[p] = lon
-                    nakshatras[p] = get_nakshatra_and_pada(lon)
-                else:
-                    positions[p] = None
-                    nakshatras[p] = ("N/A", "N/A")
-            if positions[planet1] is not None and positions[planet2] is not None:
-                sign1 = get_zodiac_sign_index(positions[planet1])
-                sign2 = get_zodiac_sign_index(positions[planet2])
-                if sign1 == sign2:
-                    deg1 = format_degree_in_sign(positions[planet1])
-                    deg2 = format_degree_in_sign(positions[planet2])
-                    n1, p1 = nakshatras[planet1]
-                    n2, p2 = nakshatras[planet2]
-                    conjunction_dates.append([
-                        current_date.strftime('%Y-%m-%d'),
-                        ZODIAC_SIGNS_SIDEREAL[sign1],
-                        f"[bold yellow]{planet1}[/bold yellow] ([cyan]{deg1}°[/cyan] {n1}-{p1})",
-                        f"[bold yellow]{planet2}[/bold yellow] ([cyan]{deg2}°[/cyan] {n2}-{p2})"
-                    ])
-            current_date += timedelta(days=1)
-            progress.update(task, advance=1)
-    if conjunction_dates:
+        results = search_pair_conjunctions(start_date_dt, end_date_dt, planet1, planet2, eph, earth, ts,
+                                           advance=lambda n=1: progress.update(task, advance=n))
+    if len(results["day"]):
         console.print(Panel.fit("[bold green]Conjunctions found:[/bold green]", style="green"))
-        print_rich_table(["Date", "Sign", f"{planet1} (Deg, Nakshatra-Pada)", f"{planet2} (Deg, Nakshatra-Pada)"], conjunction_dates)
+        show_result_pages(["Date", "Sign", f"{planet1} (Deg, Nakshatra-Pada)", f"{planet2} (Deg, Nakshatra-Pada)"], results,
+                          lambda indices: format_pair_rows(results, planet1, planet2, indices), title=f"{planet1}-{planet2} Conjunctions")
     else:
         console.print(f"[yellow]No conjunctions found for {planet1} and {planet2} in the given range.")
 
@@ -250,9 +348,8 @@ def get_location_coordinates():
             console.print("[red]Invalid input. Please enter valid numbers for latitude and longitude.[/red]")
 
 
-def print_d1_birth_chart(eph, earth, ts):
-    sidereal_mode = (config.MODE == 'sidereal')
-    console.print("[bold yellow]Enter birth details for D1 chart:[/bold yellow]")
+def get_birth_details(title):
+    console.print(f"[bold yellow]{title}[/bold yellow]")
     name = input("Name (optional): ").strip()
     while True:
         try:
@@ -312,6 +409,12 @@ def print_d1_birth_chart(eph, earth, ts):
     dt_utc = aware_local_dt.astimezone(timezone.utc)
     console.print(f"Birth Time (Local): {aware_local_dt.strftime('%Y-%m-%d %H:%M:%S %Z%z')}")
     console.print(f"Birth Time (UTC):   {dt_utc.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+    return name, dt_utc, lat, lon
+
+
+def print_d1_birth_chart(eph, earth, ts):
+    sidereal_mode = (config.MODE == 'sidereal')
+    name, dt_utc, lat, lon = get_birth_details("Enter birth details for D1 chart:")
     t_sky = ts.from_datetime(dt_utc)
     jd_ut = get_julian_day_from_skyfield_time(t_sky)
     ayanamsa = get_ayanamsa_value(jd_ut) if sidereal_mode else 0
@@ -384,10 +487,62 @@ def print_d1_birth_chart(eph, earth, ts):
         plist = ", ".join(sorted(house_planets[i])) if house_planets[i] else "-"
         house_table.add_row(str(i), house_sign_name, plist)
     console.print(house_table)
+    print_varga_table(asc_long, planet_positions)
+    if sidereal_mode and "Moon" in planet_positions:
+        print_vimshottari_dasha(planet_positions["Moon"], jd_ut, ts)
+
+
+def print_varga_table(asc_long, planet_positions):
+    from varga import SHODASHAVARGAS, compute_varga_signs
+    bodies = ["Asc"] + list(planet_positions)
+    varga_signs = compute_varga_signs([asc_long] + list(planet_positions.values()))
+    varga_table = Table(title="[bold magenta]Divisional Charts (Shodashavarga)[/bold magenta]", show_lines=True)
+    varga_table.add_column("Varga", style="bold yellow")
+    for body in bodies:
+        varga_table.add_column(body[:3], style="cyan")
+    for i, division in enumerate(SHODASHAVARGAS):
+        varga_table.add_row(f"D{division}", *[ZODIAC_SIGNS_SIDEREAL[s][:3] for s in varga_signs[:, i]])
+    console.print(varga_table)
+
+
+def print_vimshottari_dasha(moon_lon, birth_jd, ts):
+    from dasha import compute_vimshottari_dasha, find_current_dashas, DASHA_LEVEL_NAMES
+    from config import VIMSHOTTARI_LORDS
+    dasha = compute_vimshottari_dasha(moon_lon, birth_jd)
+    now_jd = ts.from_datetime(datetime.now(timezone.utc)).ut1
+    lords, starts, ends = find_current_dashas([moon_lon], [birth_jd], now_jd)
+    md_start_strs = ts.ut1_jd(dasha["md_starts"].clip(min=birth_jd)).utc_strftime('%Y-%m-%d')
+    md_end_strs = ts.ut1_jd(dasha["md_ends"]).utc_strftime('%Y-%m-%d')
+    dasha_table = Table(title="[bold magenta]Vimshottari Mahadashas[/bold magenta]", show_lines=True)
+    dasha_table.add_column("Mahadasha", style="bold yellow"); dasha_table.add_column("Start", style="cyan"); dasha_table.add_column("End", style="cyan")
+    for i in range(9):
+        dasha_table.add_row(VIMSHOTTARI_LORDS[dasha["md_lords"][i]], md_start_strs[i], md_end_strs[i])
+    console.print(Panel.fit(f"[bold blue]Dasha balance at birth: {VIMSHOTTARI_LORDS[dasha['md_lords'][0]]} {dasha['balance_years']:.2f} years[/bold blue]", style="blue"))
+    console.print(dasha_table)
+    current_rows = []
+    level_start_strs = ts.ut1_jd(starts[0]).utc_strftime('%Y-%m-%d')
+    level_end_strs = ts.ut1_jd(ends[0]).utc_strftime('%Y-%m-%d')
+    for level in range(lords.shape[-1]):
+        current_rows.append([DASHA_LEVEL_NAMES[level], VIMSHOTTARI_LORDS[lords[0, level]], level_start_strs[level], level_end_strs[level]])
+    console.print(Panel.fit("[bold green]Current Running Dasha[/bold green]", style="green"))
+    print_rich_table(["Level", "Lord", "Start", "End"], current_rows)
 
 
+def compute_transit_events(year, month_start, month_end, planets, eph, earth, ts, advance=None):
+    """Return {month: [[date, planet, sign entered], ...]} for sign changes in a year."""
+    events_by_month = {m: [] for m in range(month_start, month_end+1)}
+    last_day = (datetime(year + 1, 1, 1) if month_end == 12 else datetime(year, month_end + 1, 1)) - timedelta(days=1)
+    grid = TimeGrid.for_range(ts, datetime(year, month_start, 1), last_day)
+    signs, _ = _daily_signs(grid, planets, get_position_backend(eph, earth, ts))
+    for b, planet in enumerate(planets):
+        for d in np.nonzero(signs[1:, b] != signs[:-1, b])[0] + 1:
+            events_by_month[int(grid.month[d])].append([str(grid.labels[d]), planet, ZODIAC_SIGNS_SIDEREAL[signs[d, b]]])
+        if advance:
+            advance(len(grid))
+    return events_by_month
+
+
 def show_transits(eph, earth, ts):
-    sidereal_mode = (config.MODE == 'sidereal')
     console.print("[bold yellow]Show planetary transits[/bold yellow]")
     while True:
         try:
@@ -422,11 +577,8 @@ def show_transits(eph, earth, ts):
                     console.print("[red]Invalid month range. Try again.[/red]")
             except ValueError:
                 console.print("[red]Invalid input. Please enter valid months.[/red]")
-    from config import PLANET_SKYFIELD_NAMES, ZODIAC_SIGNS_SIDEREAL
-    from astro_utils import get_skyfield_time, get_julian_day_from_skyfield_time, get_ayanamsa_value, get_tropical_ecliptic_longitude_skyfield, get_rahu_tropical_longitude_swisseph, get_sidereal_longitude, get_zodiac_sign_index
-    import swisseph as swe
-    events_by_month = {m: [] for m in range(month_start, month_end+1)}
     total_days = sum(31 for m in range(month_start, month_end+1))
+    planets = [filter_planet] if filter_planet else ALL_PLANETS
     with Progress(
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
@@ -436,56 +588,25 @@ def show_transits(eph, earth, ts):
         console=console,
     ) as progress:
         task = progress.add_task("Calculating transits", total=total_days)
-        for planet in ALL_PLANETS:
-            if filter_planet and planet != filter_planet:
-                continue
-            prev_sign = None
-            for month in range(month_start, month_end+1):
-                for day in range(1, 32):
-                    try:
-                        t_sky = get_skyfield_time(year, month, day)
-                    except Exception:
-                        continue
-                    jd_ut = get_julian_day_from_skyfield_time(t_sky)
-                    ayanamsa = get_ayanamsa_value(jd_ut) if sidereal_mode else 0
-                    if planet in PLANET_SKYFIELD_NAMES:
-                        tropical_lon = get_tropical_ecliptic_longitude_skyfield(t_sky, PLANET_SKYFIELD_NAMES[planet], eph, earth)
-                    elif planet == "Rahu":
-                        tropical_lon = get_rahu_tropical_longitude_swisseph(jd_ut)
-                    elif planet == "Ketu":
-                        rahu_lon = get_rahu_tropical_longitude_swisseph(jd_ut)
-                        tropical_lon = (rahu_lon + 180.0) % 360.0 if rahu_lon is not None else None
-                    else:
-                        tropical_lon = None
-                    if tropical_lon is None or (sidereal_mode and ayanamsa is None):
-                        progress.update(task, advance=1)
-                        continue
-                    lon = get_sidereal_longitude(tropical_lon, ayanamsa) if sidereal_mode else tropical_lon
-                    sign_index = get_zodiac_sign_index(lon)
-                    if sign_index is None:
-                        progress.update(task, advance=1)
-                        continue
-                    if prev_sign is None:
-                        prev_sign = sign_index
-                    elif sign_index != prev_sign:
-                        events_by_month[month].append([f"{year}-{month:02d}-{day:02d}", planet, ZODIAC_SIGNS_SIDEREAL[sign_index]])
-                        prev_sign = sign_index
-                    progress.update(task, advance=1)
-    any_events = False
-    for month in range(month_start, month_end+1):
-        month_events = events_by_month[month]
-        if month_events:
-            any_events = True
-            month_name = datetime(year, month, 1).strftime("%B")
-            table = Table(title=f"[bold magenta]{month_name} {year}[/bold magenta]", show_lines=True)
-            table.add_column("Date", style="cyan")
-            table.add_column("Planet", style="bold yellow")
-            table.add_column("Sign Entered", style="bold cyan")
-            for row in month_events:
-                table.add_row(*row)
-            console.print(table)
-    if not any_events:
+        events_by_month = compute_transit_events(year, month_start, month_end, planets, eph, earth, ts,
+                                                 advance=lambda n=1: progress.update(task, advance=n))
+    months = [month for month in range(month_start, month_end+1) if events_by_month[month]]
+    if not months:
         console.print("[yellow]No transits found for the selected period.")
+        return
+
+    def render_month(i):
+        # Each month's table is only built when it is shown
+        month = months[i]
+        month_name = datetime(year, month, 1).strftime("%B")
+        table = Table(title=f"[bold magenta]{month_name} {year}[/bold magenta]", show_lines=True)
+        table.add_column("Date", style="cyan")
+        table.add_column("Planet", style="bold yellow")
+        table.add_column("Sign Entered", style="bold cyan")
+        for row in events_by_month[month]:
+            table.add_row(*row)
+        return table
+    show_paged_sections([datetime(year, month, 1).strftime("%b") for month in months], render_month)
 def find_conjunctions_with_sun_moon(start_date_dt, end_date_dt, min_planets, eph, earth, ts):
     sidereal_mode = (config.MODE == 'sidereal')
     ayanamsa_name_str = "True Chitrapaksha" if AYANAMSA_SWISSEPH == swe.SIDM_TRUE_CITRA else \
@@ -496,7 +617,7 @@ def find_conjunctions_with_sun_moon(start_date_dt, end_date_dt, min_planets, eph
     total_days = (end_date_dt - start_date_dt).days + 1
     config_table = [
         ["Time Range", f"{start_date_dt.strftime('%Y-%m-%d')} to {end_date_dt.strftime('%Y-%m-%d')}`"],
-        ["Ephemeris", "Skyfield (Sun-Saturn), pyswisseph (Rahu)"],
+        ["Ephemeris", get_position_backend(eph, earth, ts).label],
         ["Ayanamsha", ayanamsa_name_str],
         ["SE1 Path", EPHEMERIS_PATH_SWISSEPH],
         ["Min Planets (with Sun+Moon)", str(min_planets)]
@@ -505,8 +626,6 @@ def find_conjunctions_with_sun_moon(start_date_dt, end_date_dt, min_planets, eph
     console.print(Panel.fit(f"[bold magenta]{title_txt}[/bold magenta]", style="cyan"))
     print_rich_table(["Parameter", "Value"], config_table)
     current_date = start_date_dt
-    found_conjunctions = {}
-    pyswisseph_functional_for_ayanamsa = True
     pyswisseph_functional_for_rahu = True
     t_sky_initial_check = get_skyfield_time(current_date.year, current_date.month, current_date.day)
     jd_ut_initial_check = get_julian_day_from_skyfield_time(t_sky_initial_check)
@@ -522,7 +641,6 @@ def find_conjunctions_with_sun_moon(start_date_dt, end_date_dt, min_planets, eph
         console.print(f"Ensure Swiss Ephemeris .se1 files (for nodes) are in: {EPHEMERIS_PATH_SWISSEPH}")
         console.print("Continuing search, but Rahu will be excluded if this persists.")
         pyswisseph_functional_for_rahu = False
-    found_conjunctions_list = []
     with Progress(
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
@@ -532,78 +650,126 @@ def find_conjunctions_with_sun_moon(start_date_dt, end_date_dt, min_planets, eph
         console=console,
     ) as progress:
         task = progress.add_task("Calculating", total=total_days)
-        while current_date <= end_date_dt:
-            t_sky = get_skyfield_time(current_date.year, current_date.month, current_date.day)
-            jd_ut = get_julian_day_from_skyfield_time(t_sky)
-            ayanamsa = 0
-            if sidereal_mode and pyswisseph_functional_for_ayanamsa:
-                ayanamsa = get_ayanamsa_value(jd_ut)
-                if ayanamsa is None:
-                    pyswisseph_functional_for_ayanamsa = False
-            planet_positions_in_signs = defaultdict(list)
-            planet_degrees = {}
-            if (not sidereal_mode) or pyswisseph_functional_for_ayanamsa:
-                for display_name, skyfield_name in PLANET_SKYFIELD_NAMES.items():
-                    tropical_lon = get_tropical_ecliptic_longitude_skyfield(t_sky, skyfield_name, eph, earth)
-                    if tropical_lon is not None:
-                        lon = get_sidereal_longitude(tropical_lon, ayanamsa) if sidereal_mode else tropical_lon
-                        if lon is not None:
-                            sign_index = get_zodiac_sign_index(lon)
-                            if sign_index is not None:
-                                planet_positions_in_signs[sign_index].append(display_name)
-                                planet_degrees[display_name] = lon
-                # Rahu
-                if pyswisseph_functional_for_rahu:
-                    rahu_tropical_lon = get_rahu_tropical_longitude_swisseph(jd_ut)
-                    if rahu_tropical_lon is not None:
-                        rahu_lon = get_sidereal_longitude(rahu_tropical_lon, ayanamsa) if sidereal_mode else rahu_tropical_lon
-                        if rahu_lon is not None:
-                            rahu_sign_index = get_zodiac_sign_index(rahu_lon)
-                            if rahu_sign_index is not None:
-                                planet_positions_in_signs[rahu_sign_index].append("Rahu")
-                                planet_degrees["Rahu"] = rahu_lon
-                # Ketu
-                if pyswisseph_functional_for_rahu:
-                    rahu_tropical_lon = get_rahu_tropical_longitude_swisseph(jd_ut)
-                    if rahu_tropical_lon is not None:
-                        ketu_tropical_lon = (rahu_tropical_lon + 180.0) % 360.0
-                        ketu_lon = get_sidereal_longitude(ketu_tropical_lon, ayanamsa) if sidereal_mode else ketu_tropical_lon
-                        if ketu_lon is not None:
-                            ketu_sign_index = get_zodiac_sign_index(ketu_lon)
-                            if ketu_sign_index is not None:
-                                planet_positions_in_signs[ketu_sign_index].append("Ketu")
-                                planet_degrees["Ketu"] = ketu_lon
-            for sign_index, planets_in_sign in planet_positions_in_signs.items():
-                # Only consider conjunctions that include both Sun and Moon
-                if "Sun" in planets_in_sign and "Moon" in planets_in_sign and len(planets_in_sign) >= min_planets:
-                    sign_name = ZODIAC_SIGNS_SIDEREAL[sign_index]
-                    details = []
-                    for p in sorted(planets_in_sign):
-                        deg = planet_degrees.get(p, None)
-                        deg_str = format_degree_in_sign(deg)
-                        nak, pada = get_nakshatra_and_pada(deg)
-                        details.append(f"[bold yellow]{p}[/bold yellow] ([cyan]{deg_str}°[/cyan] {nak}-{pada})")
-                    planets_str = "\n".join(details)
-                    conjunction_key = (sign_name, tuple(sorted(planets_in_sign)))
-                    if conjunction_key not in found_conjunctions or \
-                       found_conjunctions[conjunction_key] != current_date - timedelta(days=1):
-                        ayanamsa_str = f"{ayanamsa:.4f}" if ayanamsa is not None else "N/A"
-                        found_conjunctions_list.append([
-                            current_date.strftime('%Y-%m-%d'),
-                            sign_name,
-                            ayanamsa_str,
-                            len(planets_in_sign),
-                            planets_str
-                        ])
-                    found_conjunctions[conjunction_key] = current_date
-            if sidereal_mode and not pyswisseph_functional_for_ayanamsa:
-                console.print("[bold red]Halting search as Ayanamsha calculation is no longer functional (pyswisseph issue).")
-                return
-            current_date += timedelta(days=1)
-            progress.update(task, advance=1)
-    if found_conjunctions_list:
+        found_conjunctions_list, halted = search_conjunctions(
+            start_date_dt, end_date_dt, min_planets, eph, earth, ts,
+            require_sun_moon=True, include_nodes=pyswisseph_functional_for_rahu,
+            advance=lambda n=1: progress.update(task, advance=n))
+    if halted:
+        console.print("[bold red]Halting search as Ayanamsha calculation is no longer functional (pyswisseph issue).")
+        return
+    if len(found_conjunctions_list["day"]):
         console.print(Panel.fit("[bold green]═══ SUN+MOON+N-PLANET CONJUNCTIONS ═══[/bold green]", style="green"))
-        print_rich_table(["Date", "Sign", "Ayanamsha", "# Planets", "Planets (Deg, Nakshatra-Pada)"], found_conjunctions_list)
+        show_result_pages(["Date", "Sign", "Ayanamsha", "# Planets", "Planets (Deg, Nakshatra-Pada)"], found_conjunctions_list,
+                          lambda indices: format_conjunction_rows(found_conjunctions_list, indices), title="Sun+Moon Conjunctions")
     else:
         console.print("[yellow]No conjunctions found meeting the criteria.")
     console.print("[bold green]Search complete.[/bold green]")
+
+
+def show_lagna_timeline(eph, earth, ts):
+    from lagna import compute_lagna_timeline, filter_lagna_events
+    console.print("[bold yellow]Lagna (ascendant) ingress timeline[/bold yellow]")
+    lat, lon = get_location_coordinates()
+    while True:
+        try:
+            start_str = input("Enter start date (YYYY-MM-DD): ").strip()
+            end_str = input("Enter end date   (YYYY-MM-DD): ").strip()
+            start_date_dt = datetime.strptime(start_str, "%Y-%m-%d")
+            end_date_dt = datetime.strptime(end_str, "%Y-%m-%d")
+            if start_date_dt <= end_date_dt:
+                break
+            else:
+                console.print("[red]Start date must be before end date.[/red]")
+        except Exception:
+            console.print("[red]Invalid date format. Please use YYYY-MM-DD.[/red]")
+    console.print("Select level: [cyan]1. Sign[/cyan], [cyan]2. Nakshatra[/cyan], [cyan]3. Pada[/cyan]")
+    level_choice = input("Enter 1, 2 or 3 [1]: ").strip()
+    level = {"2": "nakshatra", "3": "pada"}.get(level_choice, "sign")
+    jd_start = ts.utc(start_date_dt.year, start_date_dt.month, start_date_dt.day).ut1
+    jd_end = ts.utc(end_date_dt.year, end_date_dt.month, end_date_dt.day, 23, 59, 59).ut1
+    timeline = compute_lagna_timeline(jd_start, jd_end, lat, lon)
+    idx = filter_lagna_events(timeline, level)
+    if len(idx) == 0:
+        console.print("[yellow]No lagna changes found in range.")
+        return
+    event_jd, event_pada = timeline["jd"][idx], timeline["pada_to"][idx]
+
+    def get_rows(indices):
+        indices = np.asarray(indices, dtype=np.intp)
+        if len(indices) == 0:
+            return []
+        rows = []
+        for time_str, pada in zip(np.atleast_1d(ts.ut1_jd(event_jd[indices]).utc_strftime('%Y-%m-%d %H:%M:%S UTC')), event_pada[indices]):
+            pada = int(pada)
+            rows.append([time_str, ZODIAC_SIGNS_SIDEREAL[pada // 9], f"{NAKSHATRAS[pada // 4]}-{pada % 4 + 1}"])
+        return rows
+
+    def filter_rows(term):
+        term = term.capitalize()
+        if term not in ZODIAC_SIGNS_SIDEREAL:
+            return None
+        return np.nonzero(event_pada // 9 == ZODIAC_SIGNS_SIDEREAL.index(term))[0]
+    console.print(Panel.fit(f"[bold magenta]Lagna {level.capitalize()} Changes (lat: {lat:.4f}, lon: {lon:.4f})[/bold magenta]", style="cyan"))
+    show_paged_table(["Date/Time", "Lagna Sign", "Nakshatra-Pada"], len(event_jd), get_rows, title="Lagna Changes",
+                     find_row=lambda dt: int(np.searchsorted(event_jd, ts.utc(dt.year, dt.month, dt.day).ut1)),
+                     filter_rows=filter_rows)
+
+
+def get_natal_longitudes(t_sky, jd_ut, lat, lon, eph, earth, sidereal_mode):
+    """Ascendant and planet longitudes of one chart, keyed like ["Asc"] + ALL_PLANETS."""
+    ayanamsa = get_ayanamsa_value(jd_ut) if sidereal_mode else 0
+    if sidereal_mode and ayanamsa is None:
+        return None
+    cusps, ascmc = swe.houses(jd_ut, lat, lon, b'A')
+    natal = {"Asc": get_sidereal_longitude(ascmc[0], ayanamsa) if sidereal_mode else ascmc[0]}
+    for planet in ALL_PLANETS:
+        natal[planet] = float(get_planet_longitudes(planet, t_sky, eph, earth, sidereal_mode)[0])
+    return natal
+
+
+def show_transit_hits(eph, earth, ts):
+    from transit_scan import TRANSIT_BODIES, scan_transit_hits
+    sidereal_mode = (config.MODE == 'sidereal')
+    name, dt_utc, lat, lon = get_birth_details("Enter birth details for transit hits:")
+    t_birth = ts.from_datetime(dt_utc)
+    natal = get_natal_longitudes(t_birth, get_julian_day_from_skyfield_time(t_birth), lat, lon, eph, earth, sidereal_mode)
+    if natal is None:
+        console.print("[bold red]Error: Unable to compute Ayanamsa. Natal chart cannot be generated.[/bold red]")
+        return
+    while True:
+        try:
+            start_year = int(input("Enter start year (e.g. 2017): ").strip())
+            end_year = int(input("Enter end year (e.g. 2050): ").strip())
+            if start_year <= end_year:
+                break
+            else:
+                console.print("[red]Start year must be less than or equal to end year.[/red]")
+        except ValueError:
+            console.print("[red]Invalid input. Please enter a valid year.[/red]")
+    orb_str = input("Orb in degrees (leave blank for sign ingress hits): ").strip()
+    try:
+        orb = float(orb_str) if orb_str else None
+    except ValueError:
+        console.print("[red]Invalid orb. Using sign ingress hits.[/red]")
+        orb = None
+    grid = TimeGrid.for_range(ts, datetime(start_year, 1, 1), datetime(end_year, 12, 31))
+    jd_days = grid.ut1
+    backend = get_position_backend(eph, earth, ts)
+    with console.status("Calculating transit positions..."):
+        transit_lons = {body: backend.grid_longitudes(body, grid) for body in TRANSIT_BODIES}
+    points = list(natal)
+    hits = scan_transit_hits([[natal[p] for p in points]], jd_days, transit_lons, orb)
+    if len(hits["jd"]) == 0:
+        console.print("[yellow]No transit hits found for the selected period.")
+        return
+    time_fmt = '%Y-%m-%d' if orb is None else '%Y-%m-%d %H:%M UTC'
+    times = ts.ut1_jd(hits["jd"]).utc_strftime(time_fmt)
+    rows = []
+    for i, time_str in enumerate(times):
+        if orb is None:
+            event = f"enters {ZODIAC_SIGNS_SIDEREAL[int(hits['lon'][i] // 30)]}"
+        else:
+            event = f"within {orb:g}° ({format_degree_in_sign(hits['lon'][i])}° {ZODIAC_SIGNS_SIDEREAL[int(hits['lon'][i] // 30)]})"
+        rows.append([time_str, TRANSIT_BODIES[hits["body"][i]], points[hits["point"][i]], event])
+    console.print(Panel.fit(f"[bold magenta]Transit Hits for {name if name else 'Person'}[/bold magenta]", style="cyan"))
+    print_rich_table(["Date", "Transit", "Natal Point", "Event"], rows)
@@ -0,0 +1,153 @@
+# Precomputed ingress event index for DracoVed
+#
+# A one-time build samples every body in ALL_PLANETS from 1800 to 2200, finds
+# each pada change (sign and nakshatra changes are pada changes too) and
+# refines it by bisection. The events are stored per calculation mode and
+# position backend as compact sorted arrays, so "bucket of body B at time t" and "all ingresses in
+# [t0, t1]" become searchsorted lookups with no ephemeris calls.
+#
+#   python ingress_index.py [--start 1800] [--end 2200] [--tropical]
+import argparse
+import os
+import numpy as np
+import config
+from config import ALL_PLANETS, AYANAMSA_SWISSEPH, INGRESS_INDEX_DIRECTORY, INGRESS_INDEX_START_YEAR, INGRESS_INDEX_END_YEAR
+from astro_utils import load_ephemeris_context
+from position_backends import get_position_backend
+
+PADA_SPAN = 360.0 / 108
+LEVEL_DIVISORS = {"sign": 9, "nakshatra": 4, "pada": 1}
+
+# Sampling step in days: the Moon crosses a pada in about five hours, the
+# other bodies need at least a day per pada even at their fastest.
+SAMPLE_STEP_DAYS = {"Moon": 0.125}
+DEFAULT_STEP_DAYS = 1.0
+REFINE_SECONDS = 1.0
+CHUNK_SIZE = 100000
+
+
+def get_ingress_index_path(mode=None):
+    mode = mode or config.MODE
+    tag = f"sidereal_{AYANAMSA_SWISSEPH}" if mode == 'sidereal' else "tropical"
+    return os.path.join(INGRESS_INDEX_DIRECTORY, f"ingress_{tag}_{config.SEARCH_POSITION_BACKEND}.npz")
+
+
+def _padas(planet, jd_ut, backend):
+    out = np.empty(len(jd_ut), dtype=np.int8)
+    for a in range(0, len(jd_ut), CHUNK_SIZE):
+        lons = backend.longitudes(planet, jd_ut[a:a + CHUNK_SIZE])
+        out[a:a + CHUNK_SIZE] = (lons // PADA_SPAN).astype(np.int8) % 108
+    return out
+
+
+def _body_ingresses(planet, jd_start, jd_end, backend):
+    step = SAMPLE_STEP_DAYS.get(planet, DEFAULT_STEP_DAYS)
+    grid = np.append(np.arange(jd_start, jd_end, step), jd_end)
+    padas = _padas(planet, grid, backend)
+    idx = np.nonzero(padas[1:] != padas[:-1])[0]
+    lo, hi = grid[idx], grid[idx + 1]
+    before = padas[idx]
+    while len(idx) and (hi - lo).max() * 86400.0 > REFINE_SECONDS:
+        mid = (lo + hi) / 2.0
+        moved = _padas(planet, mid, backend) != before
+        hi = np.where(moved, mid, hi)
+        lo = np.where(moved, lo, mid)
+    return hi, before, padas[idx + 1], padas[0]
+
+
+def build_ingress_index(eph, earth, ts, start_year=INGRESS_INDEX_START_YEAR, end_year=INGRESS_INDEX_END_YEAR, path=None):
+    """Compute every pada ingress of ALL_PLANETS in [start_year, end_year] and save it."""
+    backend = get_position_backend(eph, earth, ts)
+    jd_start = ts.utc(start_year, 1, 1).ut1
+    jd_end = ts.utc(end_year, 12, 31, 23, 59, 59).ut1
+    times, bodies, from_padas, to_padas, offsets, initial = [], [], [], [], [0], []
+    for body_num, planet in enumerate(ALL_PLANETS):
+        jd, before, after, first = _body_ingresses(planet, jd_start, jd_end, backend)
+        times.append(jd)
+        bodies.append(np.full(len(jd), body_num, dtype=np.int8))
+        from_padas.append(before)
+        to_padas.append(after)
+        offsets.append(offsets[-1] + len(jd))
+        initial.append(first)
+    path = path or get_ingress_index_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez(path, time=np.concatenate(times), body=np.concatenate(bodies),
+             from_pada=np.concatenate(from_padas), to_pada=np.concatenate(to_padas),
+             offsets=np.array(offsets, dtype=np.int64), initial=np.array(initial, dtype=np.int8),
+             span=np.array([jd_start, jd_end]))
+    return path
+
+
+class IngressIndex:
+    """Sorted ingress events of all bodies, grouped by body in ALL_PLANETS order."""
+
+    def __init__(self, data):
+        self.time = data["time"]
+        self.body = data["body"]
+        self.from_pada = data["from_pada"]
+        self.to_pada = data["to_pada"]
+        self.offsets = data["offsets"]
+        self.initial = data["initial"]
+        self.jd_start, self.jd_end = (float(x) for x in data["span"])
+
+    def covers(self, jd_start, jd_end):
+        return self.jd_start <= jd_start and jd_end <= self.jd_end
+
+    def buckets_at(self, planet, jd_ut, level="sign"):
+        """Sign, nakshatra or pada index of a body at one or many UT Julian days."""
+        body_num = ALL_PLANETS.index(planet)
+        a, b = self.offsets[body_num], self.offsets[body_num + 1]
+        # side='right': at an ingress instant the body is already in the new bucket
+        k = np.searchsorted(self.time[a:b], jd_ut, side='right')
+        padas = np.where(k > 0, self.to_pada[a:b][np.maximum(k - 1, 0)], self.initial[body_num])
+        return padas // LEVEL_DIVISORS[level]
+
+    def ingresses_between(self, jd_start, jd_end, level="sign", planets=None):
+        """Events in [jd_start, jd_end) that change the given level, sorted by time.
+
+        Returns parallel arrays "time", "body" (index into ALL_PLANETS), "from"
+        and "to" (bucket indices at that level).
+        """
+        divisor = LEVEL_DIVISORS[level]
+        parts = []
+        for planet in planets or ALL_PLANETS:
+            body_num = ALL_PLANETS.index(planet)
+            a, b = self.offsets[body_num], self.offsets[body_num + 1]
+            lo = a + np.searchsorted(self.time[a:b], jd_start, side='left')
+            hi = a + np.searchsorted(self.time[a:b], jd_end, side='left')
+            sel = np.arange(lo, hi)
+            sel = sel[self.from_pada[sel] // divisor != self.to_pada[sel] // divisor]
+            parts.append(sel)
+        sel = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+        sel = sel[np.argsort(self.time[sel], kind='stable')]
+        return {
+            "time": self.time[sel],
+            "body": self.body[sel],
+            "from": self.from_pada[sel] // divisor,
+            "to": self.to_pada[sel] // divisor,
+        }
+
+
+_LOADED = {}
+
+
+def get_ingress_index(mode=None):
+    """Return the IngressIndex for the current mode, or None if it was never built."""
+    path = get_ingress_index_path(mode)
+    if path not in _LOADED:
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            _LOADED[path] = IngressIndex({key: data[key] for key in data.files})
+    return _LOADED[path]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the DracoVed ingress event index")
+    parser.add_argument("--start", type=int, default=INGRESS_INDEX_START_YEAR)
+    parser.add_argument("--end", type=int, default=INGRESS_INDEX_END_YEAR)
+    parser.add_argument("--tropical", action="store_true", help="build the tropical index instead of the sidereal one")
+    args = parser.parse_args()
+    eph, earth, ts = load_ephemeris_context('tropical' if args.tropical else 'sidereal')
+    print(f"Building {config.MODE} ingress index {args.start}-{args.end} with {config.SEARCH_POSITION_BACKEND} ...")
+    print(f"Saved to {build_ingress_index(eph, earth, ts, args.start, args.end)}")
@@ -0,0 +1,125 @@
+# Lagna (ascendant) ingress timeline for DracoVed
+#
+# The ascendant is a closed-form function of local sidereal time, obliquity and
+# latitude, so instead of calling swe.houses() at every probe we tabulate the
+# location-independent parts once per day, sample the ascendant on a coarse
+# vectorized grid and refine each pada change by bisection.
+import numpy as np
+import swisseph as swe
+import config
+
+PADA_SPAN = 360.0 / 108
+PADAS_PER_SIGN = 9
+PADAS_PER_NAKSHATRA = 4
+SIDEREAL_RATE = 1.00273790935  # sidereal days per mean solar day
+
+LAGNA_STEP_SECONDS = 120
+LAGNA_REFINE_SECONDS = 0.5
+LAGNA_CHUNK_DAYS = 30
+LAGNA_SPLIT = 16  # sub-intervals per round when a grid interval is too coarse
+
+
+def _build_daily_tables(jd_start, jd_end):
+    # Apparent sidereal time at Greenwich, true obliquity and ayanamsa at 0h UT of each day
+    days = np.arange(np.floor(jd_start - 0.5) + 0.5, jd_end + 1.0)
+    sidtime_deg = np.array([swe.sidtime(jd) * 15.0 for jd in days])
+    obliquity = np.array([swe.calc_ut(jd, swe.ECL_NUT)[0][0] for jd in days])
+    if config.MODE == 'sidereal':
+        ayanamsa = np.array([swe.get_ayanamsa_ut(jd) for jd in days])
+    else:
+        ayanamsa = np.zeros(len(days))
+    return days, sidtime_deg, obliquity, ayanamsa
+
+
+class _LagnaContext:
+    """Location-independent tables shared by every location in a batch."""
+
+    def __init__(self, jd_start, jd_end):
+        self.days, self.sidtime_deg, self.obliquity, self.ayanamsa = _build_daily_tables(jd_start, jd_end)
+
+    def ascendant(self, jd_ut, lat, lon):
+        jd_ut = np.asarray(jd_ut, dtype=float)
+        k = np.clip(np.searchsorted(self.days, jd_ut, side='right') - 1, 0, len(self.days) - 1)
+        ramc = np.radians((self.sidtime_deg[k] + (jd_ut - self.days[k]) * 360.0 * SIDEREAL_RATE + lon) % 360.0)
+        eps = np.radians(self.obliquity[k])
+        asc = np.degrees(np.arctan2(np.cos(ramc), -(np.sin(ramc) * np.cos(eps) + np.tan(np.radians(lat)) * np.sin(eps))))
+        # Inside the polar circles the formula can give the descendant; like
+        # swe.houses, keep the ascendant in the half of the ecliptic east of the MC.
+        mc = np.degrees(np.arctan2(np.sin(ramc), np.cos(ramc) * np.cos(eps)))
+        asc = np.where((asc - mc) % 360.0 > 180.0, asc + 180.0, asc)
+        return (asc - np.interp(jd_ut, self.days, self.ayanamsa)) % 360.0
+
+    def pada(self, jd_ut, lat, lon):
+        return (self.ascendant(jd_ut, lat, lon) // PADA_SPAN).astype(np.int16) % 108
+
+
+def _lagna_chunk(ctx, jd_start, jd_end, lat, lon, step, refine):
+    grid = np.append(np.arange(jd_start, jd_end, step), jd_end)
+    padas = ctx.pada(grid, lat, lon)
+    while True:
+        jumps = (padas[1:] - padas[:-1]) % 108
+        # A step of one pada either way is a single change (above about 66.5
+        # degrees latitude the ascendant can move backward). Larger jumps are
+        # subdivided down to the refine width; what is left there is the real
+        # half-circle flip of the ascendant at those latitudes, kept as one event.
+        coarse = np.nonzero((jumps > 1) & (jumps < 107) & ((grid[1:] - grid[:-1]) > refine))[0]
+        if len(coarse) == 0:
+            break
+        fractions = np.arange(1, LAGNA_SPLIT) / LAGNA_SPLIT
+        extra = (grid[coarse, None] + (grid[coarse + 1] - grid[coarse])[:, None] * fractions).ravel()
+        grid = np.concatenate([grid, extra])
+        padas = np.concatenate([padas, ctx.pada(extra, lat, lon)])
+        order = np.argsort(grid, kind='stable')
+        grid, padas = grid[order], padas[order]
+    idx = np.nonzero(jumps)[0]
+    lo = grid[idx]
+    hi = grid[idx + 1]
+    before = padas[idx]
+    while len(idx) and (hi - lo).max() > refine:
+        mid = (lo + hi) / 2.0
+        moved = ctx.pada(mid, lat, lon) != before
+        hi = np.where(moved, mid, hi)
+        lo = np.where(moved, lo, mid)
+    return hi, before, padas[idx + 1], int(padas[0])
+
+
+def _lagna_timeline(ctx, jd_start, jd_end, lat, lon, step_seconds, refine_seconds):
+    # Chunks keep memory bounded however long the range is
+    step, refine = step_seconds / 86400.0, refine_seconds / 86400.0
+    bounds = np.append(np.arange(jd_start, jd_end, LAGNA_CHUNK_DAYS), jd_end)
+    parts = [_lagna_chunk(ctx, a, b, lat, lon, step, refine) for a, b in zip(bounds[:-1], bounds[1:])]
+    if not parts:
+        parts = [_lagna_chunk(ctx, jd_start, jd_end, lat, lon, step, refine)]
+    return {
+        "jd": np.concatenate([p[0] for p in parts]),
+        "pada_from": np.concatenate([p[1] for p in parts]),
+        "pada_to": np.concatenate([p[2] for p in parts]),
+        "initial_pada": parts[0][3],
+    }
+
+
+def compute_lagna_timeline(jd_start, jd_end, lat, lon, step_seconds=LAGNA_STEP_SECONDS, refine_seconds=LAGNA_REFINE_SECONDS):
+    """Return every ascendant pada ingress at (lat, lon) between two UT Julian days.
+
+    The result holds parallel arrays: "jd" (instant the new pada begins),
+    "pada_from" and "pada_to" (0-107, sign = pada // 9, nakshatra = pada // 4).
+    """
+    ctx = _LagnaContext(jd_start, jd_end)
+    return _lagna_timeline(ctx, jd_start, jd_end, lat, lon, step_seconds, refine_seconds)
+
+
+def compute_lagna_timelines(jd_start, jd_end, locations, step_seconds=LAGNA_STEP_SECONDS, refine_seconds=LAGNA_REFINE_SECONDS):
+    """Batch version of compute_lagna_timeline for a list of (lat, lon) pairs."""
+    ctx = _LagnaContext(jd_start, jd_end)
+    return [_lagna_timeline(ctx, jd_start, jd_end, lat, lon, step_seconds, refine_seconds) for lat, lon in locations]
+
+
+def filter_lagna_events(timeline, level):
+    """Indices of events in a timeline that change the 'sign', 'nakshatra' or 'pada'."""
+    if level == 'sign':
+        span = PADAS_PER_SIGN
+    elif level == 'nakshatra':
+        span = PADAS_PER_NAKSHATRA
+    else:
+        span = 1
+    return np.nonzero(timeline["pada_from"] // span != timeline["pada_to"] // span)[0]
@@ -0,0 +1,198 @@
+# Position backends for DracoVed
+#
+# A backend turns an array of UT1 Julian days into longitudes of one body in
+# the current mode. SkyfieldBackend is the existing stack (Skyfield for Sun to
+# Saturn, swisseph for the nodes and ayanamsa); SwissEphemerisBackend takes
+# every body from swe.calc_ut. Both subtract the same swe.get_ayanamsa_ut value
+# in sidereal mode, so they can only differ by their tropical positions.
+# Sign-level searches use the backend named by SEARCH_POSITION_BACKEND.
+## DailyPositionCache holds the noon UT longitude of every body on every day in
+# a file that several processes map at once (the query service and its search
+# workers). Once one is installed with use_position_cache, the configured
+# backend fills and reads it for every TimeGrid it is asked about.
+#
+#   python position_backends.py [--start 2000] [--end 2010] [--step 0.5]
+# compares the two backends over a date range and times them.
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+import numpy as np
+import swisseph as swe
+import config
+from config import ALL_PLANETS, SWISSEPH_PLANET_IDS, INGRESS_INDEX_START_YEAR, INGRESS_INDEX_END_YEAR
+from astro_utils import get_planet_longitudes, load_ephemeris_context
+
+
+class PositionBackend:
+    """Longitudes of the bodies in ALL_PLANETS for arrays of UT1 Julian days."""
+    name = None
+    label = None
+
+    def longitudes(self, planet, jd_ut):
+        raise NotImplementedError
+
+    def grid_longitudes(self, planet, grid, days=None):
+        """Longitudes on every day of a TimeGrid, or on the given day offsets."""
+        return self.longitudes(planet, grid.ut1 if days is None else grid.ut1[days])
+
+
+class SkyfieldBackend(PositionBackend):
+    name = "skyfield"
+    label = "Skyfield (Sun-Saturn), pyswisseph (Rahu)"
+
+    def __init__(self, eph, earth, ts):
+        self.eph, self.earth, self.ts = eph, earth, ts
+
+    def longitudes(self, planet, jd_ut):
+        t_sky = self.ts.ut1_jd(np.atleast_1d(np.asarray(jd_ut, dtype=float)))
+        return get_planet_longitudes(planet, t_sky, self.eph, self.earth, config.MODE == 'sidereal')
+
+    def grid_longitudes(self, planet, grid, days=None):
+        # Reuse the grid's Skyfield Time instead of rebuilding one from Julian days
+        t_sky = grid.time if days is None else grid.time[days]
+        return get_planet_longitudes(planet, t_sky, self.eph, self.earth, config.MODE == 'sidereal')
+
+
+class SwissEphemerisBackend(PositionBackend):
+    name = "swisseph"
+    label = "pyswisseph (all bodies)"
+    # Astrometric positions (light-time only), like Skyfield's observe()
+    FLAGS = swe.FLG_SWIEPH | swe.FLG_NOABERR | swe.FLG_NOGDEFL
+
+    def longitudes(self, planet, jd_ut):
+        jd_ut = np.atleast_1d(np.asarray(jd_ut, dtype=float))
+        body_id = SWISSEPH_PLANET_IDS["Rahu" if planet == "Ketu" else planet]
+        lons = np.array([swe.calc_ut(jd, body_id, self.FLAGS)[0][0] for jd in jd_ut])
+        if config.MODE == 'sidereal':
+            # Same ayanamsa as get_ayanamsa_value, not the one FLG_SIDEREAL applies
+            lons = lons - np.array([swe.get_ayanamsa_ut(jd) for jd in jd_ut])
+        if planet == "Ketu":
+            lons = lons + 180.0
+        return lons % 360.0
+
+
+class DailyPositionCache:
+    """Noon UT longitudes per body and day for one mode and backend, NaN until computed."""
+
+    def __init__(self, path, mode, backend_name, start_ordinal, days, create=False):
+        self.path, self.mode, self.backend_name = path, mode, backend_name
+        self.start_ordinal, self.days = start_ordinal, days
+        self.lons = np.memmap(path, dtype=np.float64, mode='w+' if create else 'r+', shape=(len(ALL_PLANETS), days))
+        if create:
+            self.lons[:] = np.nan
+            self.lons.flush()
+
+    @classmethod
+    def create(cls, start_year=INGRESS_INDEX_START_YEAR, end_year=INGRESS_INDEX_END_YEAR):
+        """New cache file for the current mode and SEARCH_POSITION_BACKEND."""
+        fd, path = tempfile.mkstemp(prefix="dracoved_positions_", suffix=".dat")
+        os.close(fd)
+        start = date(start_year, 1, 1).toordinal()
+        return cls(path, config.MODE, config.SEARCH_POSITION_BACKEND, start,
+                   date(end_year, 12, 31).toordinal() - start + 1, create=True)
+
+    def spec(self):
+        """Arguments that let another process open the same cache."""
+        return (self.path, self.mode, self.backend_name, self.start_ordinal, self.days)
+
+    def remove(self):
+        del self.lons
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class CachedBackend(PositionBackend):
+    """Wraps a backend so noon grid positions go through a DailyPositionCache."""
+
+    def __init__(self, backend, cache):
+        self.backend, self.cache = backend, cache
+        self.name, self.label = backend.name, backend.label
+
+    def longitudes(self, planet, jd_ut):
+        return self.backend.longitudes(planet, jd_ut)
+
+    def grid_longitudes(self, planet, grid, days=None):
+        offsets = grid.ordinal - self.cache.start_ordinal
+        if days is not None:
+            offsets = offsets[days]
+        if grid.hour != 12 or len(offsets) == 0 or offsets.min() < 0 or offsets.max() >= self.cache.days:
+            return self.backend.grid_longitudes(planet, grid, days)
+        row = self.cache.lons[ALL_PLANETS.index(planet)]
+        lons = np.array(row[offsets])
+        missing = np.nonzero(np.isnan(lons))[0]
+        if len(missing):
+            # Processes filling the same day concurrently write the same value
+            lons[missing] = self.backend.grid_longitudes(planet, grid, missing if days is None else np.asarray(days)[missing])
+            row[offsets[missing]] = lons[missing]
+        return lons
+
+
+_POSITION_CACHE = None
+
+
+def use_position_cache(cache):
+    """Route grid positions of the configured backend through cache (None to stop)."""
+    global _POSITION_CACHE
+    _POSITION_CACHE = cache
+
+
+def get_position_backend(eph, earth, ts, name=None):
+    """Return the backend called name, by default SEARCH_POSITION_BACKEND."""
+    name = name or config.SEARCH_POSITION_BACKEND
+    if name == "skyfield":
+        backend = SkyfieldBackend(eph, earth, ts)
+    elif name == "swisseph":
+        backend = SwissEphemerisBackend()
+    else:
+        raise ValueError(f"Unknown position backend: {name}")
+    cache = _POSITION_CACHE
+    if cache is not None and cache.mode == config.MODE and cache.backend_name == name:
+        return CachedBackend(backend, cache)
+    return backend
+
+
+def cross_validate(backend_a, backend_b, jd_ut, planets=ALL_PLANETS):
+    """Largest longitude difference in arcseconds per body, with the JD where it occurs."""
+    report = {}
+    for planet in planets:
+        diff = np.abs((backend_a.longitudes(planet, jd_ut) - backend_b.longitudes(planet, jd_ut) + 180.0) % 360.0 - 180.0)
+        worst = int(np.argmax(diff))
+        report[planet] = (float(diff[worst]) * 3600.0, float(jd_ut[worst]))
+    return report
+
+
+def benchmark_backend(backend, jd_ut, planets=ALL_PLANETS):
+    """Microseconds per sample for each body."""
+    timings = {}
+    for planet in planets:
+        start = time.perf_counter()
+        backend.longitudes(planet, jd_ut)
+        timings[planet] = (time.perf_counter() - start) / len(jd_ut) * 1e6
+    return timings
+
+
+if __name__ == "__main__":
+    from display_utils import console, print_rich_table
+    parser = argparse.ArgumentParser(description="Cross-validate and time the DracoVed position backends")
+    parser.add_argument("--start", type=int, default=2000)
+    parser.add_argument("--end", type=int, default=2010)
+    parser.add_argument("--step", type=float, default=0.5, help="sample spacing in days")
+    parser.add_argument("--tropical", action="store_true")
+    args = parser.parse_args()
+    eph, earth, ts = load_ephemeris_context('tropical' if args.tropical else 'sidereal')
+    jd_ut = np.arange(ts.utc(args.start, 1, 1).ut1, ts.utc(args.end, 12, 31).ut1, args.step)
+    skyfield, swiss = SkyfieldBackend(eph, earth, ts), SwissEphemerisBackend()
+    console.print(f"[bold magenta]{config.MODE.capitalize()} longitudes, {len(jd_ut)} samples {args.start}-{args.end}[/bold magenta]")
+    report = cross_validate(skyfield, swiss, jd_ut)
+    timing_sky = benchmark_backend(skyfield, jd_ut)
+    timing_swe = benchmark_backend(swiss, jd_ut)
+    rows = []
+    for planet in ALL_PLANETS:
+        arcsec, jd_worst = report[planet]
+        faster = "skyfield" if timing_sky[planet] < timing_swe[planet] else "swisseph"
+        rows.append([planet, f"{arcsec:.2f}", ts.ut1_jd(jd_worst).utc_strftime('%Y-%m-%d %H:%M'),
+                     f"{timing_sky[planet]:.2f}", f"{timing_swe[planet]:.2f}", faster])
+    print_rich_table(["Body", "Max diff (\")", "At (UTC)", "Skyfield µs", "swisseph µs", "Faster"], rows)
+    console.print(f"Total: skyfield {sum(timing_sky.values()):.2f} µs, swisseph {sum(timing_swe.values()):.2f} µs per sample of all bodies")
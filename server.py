@@ -0,0 +1,317 @@
+# Local query service for DracoVed
+#
+# Loads the ephemeris context once and answers JSON requests over HTTP on
+# localhost (or a Unix socket). Chart lookups run inline on the event loop;
+# their planet positions are memoized in the main process per exact instant,
+# so repeated charts for the same moment at other places skip the ephemeris.
+# Long searches go to a process pool so they never hold up small requests.
+# The searches share one DailyPositionCache file across all workers, so a day
+# computed by one request is looked up by every later request. Identical
+# requests in flight are coalesced.
+#
+#   python server.py [--port 8765] [--unix /tmp/dracoved.sock] [--workers 2] [--tropical]
+#
+#   GET /chart?datetime=1990-05-01T10:30:00&lat=28.61&lon=77.21
+#   GET /lagna?start=2025-01-01&end=2025-01-31&lat=28.61&lon=77.21&level=sign
+#   GET /transits?year=2025[&planet=Saturn][&month_start=1&month_end=12]
+#   GET /conjunctions?start=2025-01-01&end=2030-12-31&min_planets=4[&sun_moon=1]
+#   GET /pair?start=2025-01-01&end=2030-12-31&planet1=Mars&planet2=Saturn
+#
+# A /lagna range may span at most MAX_LAGNA_DAYS, a /conjunctions or /pair
+# range at most MAX_SEARCH_DAYS; split longer queries into several requests.
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from urllib.parse import urlsplit, parse_qs
+import swisseph as swe
+import config
+from config import ALL_PLANETS, ZODIAC_SIGNS_SIDEREAL, NAKSHATRAS
+from astro_utils import load_ephemeris_context, get_ayanamsa_value, get_sidereal_longitude, get_planet_longitudes, get_nakshatra_and_pada
+from position_backends import DailyPositionCache, use_position_cache
+
+DEFAULT_PORT = 8765
+POSITION_CACHE_SIZE = 8192
+MAX_LAGNA_DAYS = 366
+MAX_SEARCH_DAYS = 36525
+
+_CTX = {}
+_REQUIRED = object()
+
+
+def load_context(mode='sidereal'):
+    eph, earth, ts = load_ephemeris_context(mode)
+    _CTX.update(eph=eph, earth=earth, ts=ts)
+    return _CTX
+
+
+def _param(params, name, cast=str, default=_REQUIRED):
+    if name not in params:
+        if default is _REQUIRED:
+            raise ValueError(f"missing parameter: {name}")
+        return default
+    try:
+        return cast(params[name])
+    except ValueError:
+        raise ValueError(f"invalid value for {name}: {params[name]}")
+
+
+def _parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def _date_range(params, max_days):
+    start = _param(params, "start", _parse_date)
+    end = _param(params, "end", _parse_date)
+    if end < start:
+        raise ValueError("end is before start")
+    if (end - start).days + 1 > max_days:
+        raise ValueError(f"range too long: at most {max_days} days per request")
+    return start, end
+
+
+def _parse_datetime_utc(value):
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _planet_name(value):
+    name = value.strip().capitalize()
+    if name not in ALL_PLANETS:
+        raise ValueError(f"unknown planet: {value}")
+    return name
+
+
+def _describe_longitude(lon):
+    nak, pada = get_nakshatra_and_pada(lon)
+    return {"lon": round(lon, 6), "sign": ZODIAC_SIGNS_SIDEREAL[int(lon // 30)], "degree": round(lon % 30, 4), "nakshatra": nak, "pada": pada}
+
+
+# --- Chart (inline, cached) ---
+
+@lru_cache(maxsize=POSITION_CACHE_SIZE)
+def _cached_planet_longitudes(dt_utc):
+    # Planet positions do not depend on the location, so one entry serves every
+    # chart cast for the same instant.
+    t_sky = _CTX["ts"].from_datetime(dt_utc)
+    sidereal_mode = (config.MODE == 'sidereal')
+    lons = {planet: float(get_planet_longitudes(planet, t_sky, _CTX["eph"], _CTX["earth"], sidereal_mode)[0]) for planet in ALL_PLANETS}
+    return t_sky.ut1, lons
+
+
+def compute_chart(dt_utc, lat, lon):
+    from varga import SHODASHAVARGAS, compute_varga_signs
+    from dasha import find_current_dashas, DASHA_LEVEL_NAMES
+    from config import VIMSHOTTARI_LORDS
+    sidereal_mode = (config.MODE == 'sidereal')
+    jd_ut, planet_lons = _cached_planet_longitudes(dt_utc)
+    ayanamsa = get_ayanamsa_value(jd_ut) if sidereal_mode else 0
+    if sidereal_mode and ayanamsa is None:
+        raise RuntimeError("unable to compute Ayanamsa")
+    cusps, ascmc = swe.houses(jd_ut, lat, lon, b'A')
+    points = {"Asc": get_sidereal_longitude(ascmc[0], ayanamsa) if sidereal_mode else ascmc[0]}
+    points.update(planet_lons)
+    asc_sign = int(points["Asc"] // 30)
+    varga_signs = compute_varga_signs(list(points.values()))
+    chart = {
+        "datetime_utc": dt_utc.isoformat(),
+        "jd_ut": jd_ut,
+        "mode": config.MODE,
+        "ayanamsa": ayanamsa if sidereal_mode else None,
+        "points": {name: _describe_longitude(p_lon) for name, p_lon in points.items()},
+        "houses": {name: (int(p_lon // 30) - asc_sign) % 12 + 1 for name, p_lon in planet_lons.items()},
+        "vargas": {f"D{d}": {name: ZODIAC_SIGNS_SIDEREAL[varga_signs[i, j]] for i, name in enumerate(points)} for j, d in enumerate(SHODASHAVARGAS)},
+    }
+    if sidereal_mode:
+        now_jd = _CTX["ts"].from_datetime(datetime.now(timezone.utc)).ut1
+        lords, starts, ends = find_current_dashas([planet_lons["Moon"]], [jd_ut], now_jd)
+        chart["dasha"] = [
+            {"level": DASHA_LEVEL_NAMES[i], "lord": VIMSHOTTARI_LORDS[lords[0, i]], "start_jd": starts[0, i], "end_jd": ends[0, i]}
+            for i in range(lords.shape[-1])
+        ]
+    return chart
+
+
+# --- Heavy jobs (run in worker processes) ---
+
+def _job_lagna(params):
+    from lagna import compute_lagna_timeline, filter_lagna_events
+    ts = _CTX["ts"]
+    start, end = _date_range(params, MAX_LAGNA_DAYS)
+    jd_start = ts.utc(start.year, start.month, start.day).ut1
+    jd_end = ts.utc(end.year, end.month, end.day, 23, 59, 59).ut1
+    timeline = compute_lagna_timeline(jd_start, jd_end, _param(params, "lat", float), _param(params, "lon", float))
+    idx = filter_lagna_events(timeline, _param(params, "level", str, "sign"))
+    if len(idx) == 0:
+        return []
+    times = ts.ut1_jd(timeline["jd"][idx]).utc_strftime('%Y-%m-%dT%H:%M:%SZ')
+    return [
+        {"time": time_str, "sign": ZODIAC_SIGNS_SIDEREAL[int(pada) // 9], "nakshatra": NAKSHATRAS[int(pada) // 4], "pada": int(pada) % 4 + 1}
+        for time_str, pada in zip(times, timeline["pada_to"][idx])
+    ]
+
+
+def _job_transits(params):
+    from features import compute_transit_events
+    year = _param(params, "year", int)
+    planet = _param(params, "planet", _planet_name, None)
+    month_start = _param(params, "month_start", int, 1)
+    month_end = _param(params, "month_end", int, 12)
+    events_by_month = compute_transit_events(year, month_start, month_end, [planet] if planet else ALL_PLANETS,
+                                             _CTX["eph"], _CTX["earth"], _CTX["ts"])
+    return [{"date": date, "planet": p, "sign": sign} for month in sorted(events_by_month) for date, p, sign in events_by_month[month]]
+
+
+def _job_conjunctions(params):
+    from features import search_conjunctions, conjunction_bodies
+    start, end = _date_range(params, MAX_SEARCH_DAYS)
+    results, halted = search_conjunctions(
+        start, end, _param(params, "min_planets", int),
+        _CTX["eph"], _CTX["earth"], _CTX["ts"], require_sun_moon=_param(params, "sun_moon", int, 0) == 1)
+    if halted:
+        raise RuntimeError("Ayanamsha calculation is no longer functional (pyswisseph issue)")
+    return [
+        {"date": date.fromordinal(int(day)).isoformat(), "sign": ZODIAC_SIGNS_SIDEREAL[sign_index],
+         "ayanamsa": round(float(ayanamsa), 4),
+         "planets": {p: _describe_longitude(float(lons[ALL_PLANETS.index(p)])) for p in conjunction_bodies(int(mask))}}
+        for day, sign_index, mask, ayanamsa, lons in zip(results["day"], results["sign"], results["bodies"], results["ayanamsa"], results["lon"])
+    ]
+
+
+def _job_pair(params):
+    from features import search_pair_conjunctions
+    planet1 = _param(params, "planet1", _planet_name)
+    planet2 = _param(params, "planet2", _planet_name)
+    start, end = _date_range(params, MAX_SEARCH_DAYS)
+    results = search_pair_conjunctions(start, end, planet1, planet2, _CTX["eph"], _CTX["earth"], _CTX["ts"])
+    return [
+        {"date": date.fromordinal(int(day)).isoformat(), "sign": ZODIAC_SIGNS_SIDEREAL[sign_index],
+         planet1: _describe_longitude(float(lon1)), planet2: _describe_longitude(float(lon2))}
+        for day, sign_index, lon1, lon2 in zip(results["day"], results["sign"], results["lon1"], results["lon2"])
+    ]
+
+
+WORKER_JOBS = {
+    "/lagna": _job_lagna,
+    "/transits": _job_transits,
+    "/conjunctions": _job_conjunctions,
+    "/pair": _job_pair,
+}
+
+
+def _worker_init(mode, cache_spec):
+    load_context(mode)
+    use_position_cache(DailyPositionCache(*cache_spec))
+
+
+def _worker_run(path, params):
+    # Encode in the worker: unpickling and encoding a large result on the
+    # event loop would hold up every chart request behind it.
+    return json.dumps(WORKER_JOBS[path](params)).encode()
+
+
+def _worker_ready():
+    return os.getpid()
+
+
+# --- HTTP front end ---
+
+class QueryServer:
+    def __init__(self, mode='sidereal', workers=None):
+        self.mode = mode
+        load_context(mode)
+        self.position_cache = DailyPositionCache.create()
+        # Spawned (not forked) workers do not inherit open client sockets, and
+        # each loads its own ephemeris context and maps the position cache once
+        # in the initializer.
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_worker_init, initargs=(mode, self.position_cache.spec()))
+        self.inflight = {}
+
+    async def dispatch(self, path, params):
+        if path == "/health":
+            return {"status": "ok", "mode": self.mode}
+        key = (path, tuple(sorted(params.items())))
+        pending = self.inflight.get(key)
+        if pending is None:
+            if path == "/chart":
+                # Charts are cheap and answered inline; coalescing only helps
+                # when a burst of identical heavy queries arrives.
+                dt_utc = _param(params, "datetime", _parse_datetime_utc)
+                return compute_chart(dt_utc, _param(params, "lat", float), _param(params, "lon", float))
+            if path not in WORKER_JOBS:
+                raise LookupError(path)
+            loop = asyncio.get_running_loop()
+            pending = asyncio.ensure_future(loop.run_in_executor(self.pool, _worker_run, path, params))
+            self.inflight[key] = pending
+            pending.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def handle(self, reader, writer):
+        status, payload = 200, None
+        try:
+            request_line = (await reader.readline()).decode('latin-1')
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            method, target, _ = request_line.split(' ', 2)
+            if method != 'GET':
+                status, payload = 405, {"error": "only GET is supported"}
+            else:
+                url = urlsplit(target)
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                payload = await self.dispatch(url.path, params)
+        except LookupError as e:
+            status, payload = 404, {"error": f"unknown endpoint: {e}"}
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": str(e)}
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, port=DEFAULT_PORT, unix_path=None):
+        # Start every worker up front so the first long search does not also
+        # pay for loading the ephemeris.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.pool, _worker_ready) for _ in range(self.pool._max_workers)])
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle, path=unix_path)
+            where = unix_path
+        else:
+            # Local only: never bind to a public interface
+            server = await asyncio.start_server(self.handle, host='127.0.0.1', port=port)
+            where = f"http://127.0.0.1:{port}"
+        print(f"DracoVed query service ({self.mode}) listening on {where}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(wait=False)
+            self.position_cache.remove()
+            if unix_path and os.path.exists(unix_path):
+                os.remove(unix_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DracoVed local query service")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="serve on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for long searches")
+    parser.add_argument("--tropical", action="store_true", help="use tropical instead of sidereal positions")
+    args = parser.parse_args()
+    query_server = QueryServer('tropical' if args.tropical else 'sidereal', args.workers)
+    try:
+        asyncio.run(query_server.serve(args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
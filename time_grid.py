@@ -0,0 +1,39 @@
+# Daily time grid for DracoVed scans
+#
+# A scan over a date range samples one instant per day (noon UT by default).
+# TimeGrid builds the whole range as a single vector Skyfield Time, which
+# position backends reuse, and keeps its UT1 Julian days and calendar fields
+# as NumPy arrays, so scan loops work on integer day offsets and only turn an
+# offset back into a date for the rows they report.
+from datetime import datetime
+import numpy as np
+
+
+class TimeGrid:
+    """One instant per day from start_date_dt for a number of days."""
+
+    def __init__(self, ts, start_date_dt, days, hour=12):
+        self.start = datetime(start_date_dt.year, start_date_dt.month, start_date_dt.day)
+        self.hour = hour
+        offsets = np.arange(max(days, 0))
+        self.time = ts.utc(self.start.year, self.start.month, self.start.day + offsets, hour)
+        self.ut1 = np.atleast_1d(self.time.ut1)
+        self.ordinal = (self.start.toordinal() + offsets).astype(np.int32)
+        dates = np.datetime64(self.start.date()) + offsets
+        self.month = (dates.astype('datetime64[M]').astype(np.int64) % 12 + 1).astype(np.int8)
+        self._labels = None
+
+    @classmethod
+    def for_range(cls, ts, start_date_dt, end_date_dt, hour=12):
+        """Grid covering start_date_dt to end_date_dt inclusive."""
+        return cls(ts, start_date_dt, (end_date_dt - start_date_dt).days + 1, hour)
+
+    def __len__(self):
+        return len(self.ordinal)
+
+    @property
+    def labels(self):
+        """'YYYY-MM-DD' label of every day, built on first use."""
+        if self._labels is None:
+            self._labels = np.datetime_as_string(np.datetime64(self.start.date()) + np.arange(len(self)), unit='D')
+        return self._labels
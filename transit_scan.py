@@ -0,0 +1,115 @@
+# Transit-to-natal hit scanner for cohorts of charts
+#
+# All natal points of the cohort go into one index sorted by longitude. Each
+# transit body is then walked through time once: sign ingresses and daily
+# motion segments are turned into longitude ranges and matched against the
+# index with searchsorted, so the work grows with transit events and hits
+# rather than with charts x days.
+import numpy as np
+
+TRANSIT_BODIES = ["Saturn", "Jupiter", "Rahu", "Ketu"]
+
+
+def build_natal_index(natal_lons):
+    """Sort every natal point of a (charts, points) longitude array.
+
+    Missing points may be NaN and are left out. Returns the sorted longitudes
+    with the chart and point index of each entry.
+    """
+    natal_lons = np.asarray(natal_lons, dtype=float)
+    charts, points = np.nonzero(~np.isnan(natal_lons))
+    lons = natal_lons[charts, points] % 360.0
+    order = np.argsort(lons, kind='stable')
+    return {
+        "lon": lons[order],
+        "chart": charts[order].astype(np.int32),
+        "point": points[order].astype(np.int16),
+    }
+
+
+def _extend_index(index):
+    # Copies shifted by -360 and +360 let wrapped ranges be matched with a
+    # single searchsorted pair.
+    n = len(index["lon"])
+    lon = np.concatenate([index["lon"] - 360.0, index["lon"], index["lon"] + 360.0])
+    return lon, np.tile(np.arange(n), 3)
+
+
+def _expand_ranges(lo_idx, hi_idx):
+    # Turn per-event [lo, hi) slices of the index into flat (event, entry) pairs
+    counts = hi_idx - lo_idx
+    events = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return events, lo_idx[events] + offsets
+
+
+def _sign_hits(index, jd_days, lons):
+    signs = (lons // 30.0).astype(np.int64) % 12
+    event_days = np.nonzero(signs[1:] != signs[:-1])[0] + 1
+    entered = signs[event_days]
+    bounds = np.searchsorted(index["lon"], np.arange(13) * 30.0)
+    events, entries = _expand_ranges(bounds[entered], bounds[entered + 1])
+    return jd_days[event_days][events], entries, entered[events].astype(np.float64) * 30.0
+
+
+def _orb_hits(index, jd_days, lons, orb):
+    ext_lon, ext_entry = _extend_index(index)
+    start = lons[:-1]
+    delta = (lons[1:] - start + 180.0) % 360.0 - 180.0
+    # Entering the orb means crossing natal - orb moving direct, or natal + orb
+    # moving retrograde, during the day's motion.
+    lo = np.where(delta >= 0, start + orb, start + delta - orb)
+    hi = np.where(delta >= 0, start + delta + orb, start - orb)
+    events, ext = _expand_ranges(np.searchsorted(ext_lon, lo, side='right'), np.searchsorted(ext_lon, hi, side='right'))
+    # Events only exist where the body moved, so delta is never zero here
+    boundary = np.where(delta[events] >= 0, ext_lon[ext] - orb, ext_lon[ext] + orb)
+    frac = (boundary - start[events]) / delta[events]
+    jd = jd_days[:-1][events] + frac * (jd_days[1:] - jd_days[:-1])[events]
+    return jd, ext_entry[ext], index["lon"][ext_entry[ext]]
+
+
+def scan_transit_hits(natal_lons, jd_days, transit_lons, orb=None):
+    """Find transit hits on a cohort of natal charts.
+
+    natal_lons is a (charts, points) array of sidereal longitudes, jd_days the
+    sample instants and transit_lons a dict of body name to longitudes at those
+    instants. With orb=None a hit is a transit body entering the sign holding a
+    natal point; otherwise it is the body coming within orb degrees of it.
+
+    Returns parallel arrays sorted by chart and time: "chart", "point",
+    "body" (index into transit_lons), "jd" and "lon" (sign start or natal
+    longitude that was hit).
+    """
+    index = build_natal_index(natal_lons)
+    jd_days = np.asarray(jd_days, dtype=float)
+    parts = []
+    for body_num, lons in enumerate(transit_lons.values()):
+        lons = np.asarray(lons, dtype=float) % 360.0
+        if orb is None:
+            jd, entries, hit_lon = _sign_hits(index, jd_days, lons)
+        else:
+            jd, entries, hit_lon = _orb_hits(index, jd_days, lons, orb)
+        parts.append((jd, entries, hit_lon, np.full(len(jd), body_num, dtype=np.int8)))
+    jd = np.concatenate([p[0] for p in parts])
+    entries = np.concatenate([p[1] for p in parts]).astype(np.intp)
+    hit_lon = np.concatenate([p[2] for p in parts])
+    body = np.concatenate([p[3] for p in parts])
+    chart = index["chart"][entries]
+    order = np.lexsort((jd, chart))
+    return {
+        "chart": chart[order],
+        "point": index["point"][entries][order],
+        "body": body[order],
+        "jd": jd[order],
+        "lon": hit_lon[order],
+    }
+
+
+def iter_hits_by_chart(hits):
+    """Yield (chart, hits) per chart, where hits holds that chart's slice of every column."""
+    charts = hits["chart"]
+    if len(charts) == 0:
+        return
+    starts = np.concatenate([[0], np.nonzero(charts[1:] != charts[:-1])[0] + 1, [len(charts)]])
+    for a, b in zip(starts[:-1], starts[1:]):
+        yield int(charts[a]), {key: column[a:b] for key, column in hits.items()}
@@ -0,0 +1,104 @@
+# Divisional charts (vargas) for DracoVed
+#
+# Every varga is reduced to a (12, n) lookup table: a longitude falls in sign s
+# and in part k of n equal parts of that sign, and the table gives the varga
+# sign. Unequal divisions (the Trimsamsa) are tabulated at a finer equal
+# resolution, so all vargas share the same vectorized lookup.
+import numpy as np
+
+SHODASHAVARGAS = [1, 2, 3, 4, 7, 9, 10, 12, 16, 20, 24, 27, 30, 40, 45, 60]
+
+VARGA_NAMES = {
+    1: "Rasi", 2: "Hora", 3: "Drekkana", 4: "Chaturthamsa", 7: "Saptamsa", 9: "Navamsa",
+    10: "Dasamsa", 12: "Dwadasamsa", 16: "Shodasamsa", 20: "Vimsamsa", 24: "Chaturvimsamsa",
+    27: "Bhamsa", 30: "Trimsamsa", 40: "Khavedamsa", 45: "Akshavedamsa", 60: "Shashtiamsa"
+}
+
+# Trimsamsa boundaries in degrees and the signs ruled by Mars, Saturn, Jupiter,
+# Mercury and Venus; even signs use the reversed order.
+_TRIMSAMSA_ODD = [(5, 0), (10, 10), (18, 8), (25, 2), (30, 6)]
+_TRIMSAMSA_EVEN = [(5, 1), (12, 5), (20, 11), (25, 9), (30, 7)]
+
+
+def _start_by_parity(odd_start, even_start):
+    # odd_start/even_start are offsets from the sign itself (0 = the sign)
+    return lambda sign: sign + (odd_start if sign % 2 == 0 else even_start)
+
+
+def _start_by_modality(movable, fixed, dual):
+    # movable/fixed/dual are absolute starting signs
+    return lambda sign: (movable, fixed, dual)[sign % 3]
+
+
+def _trimsamsa_row(sign):
+    bounds = _TRIMSAMSA_ODD if sign % 2 == 0 else _TRIMSAMSA_EVEN
+    row = []
+    for degree in range(30):
+        row.append(next(target for end, target in bounds if degree < end))
+    return row
+
+
+def _hora_row(sign):
+    # Odd signs: Sun's hora (Leo) then Moon's (Cancer); even signs the reverse
+    return [4, 3] if sign % 2 == 0 else [3, 4]
+
+
+# Each rule gives the varga sign of part 0; later parts count forward from it.
+_VARGA_STARTS = {
+    1: lambda sign: sign,
+    3: lambda sign: sign,
+    4: lambda sign: sign,
+    7: _start_by_parity(0, 6),
+    9: lambda sign: sign * 9,
+    10: _start_by_parity(0, 8),
+    12: lambda sign: sign,
+    16: _start_by_modality(0, 4, 8),
+    20: _start_by_modality(0, 8, 4),
+    24: lambda sign: 4 if sign % 2 == 0 else 3,
+    27: lambda sign: sign * 27,
+    40: lambda sign: 0 if sign % 2 == 0 else 6,
+    45: _start_by_modality(0, 4, 8),
+    60: lambda sign: sign,
+}
+# Drekkana and Chaturthamsa step by trines and kendras instead of single signs
+_VARGA_STEPS = {3: 4, 4: 3}
+
+
+def build_varga_table(division):
+    """Return the (12, parts) int8 table mapping (sign, part) to the varga sign."""
+    if division == 2:
+        rows = [_hora_row(sign) for sign in range(12)]
+    elif division == 30:
+        rows = [_trimsamsa_row(sign) for sign in range(12)]
+    elif division in _VARGA_STARTS:
+        step = _VARGA_STEPS.get(division, 1)
+        start = _VARGA_STARTS[division]
+        rows = [[(start(sign) + k * step) % 12 for k in range(division)] for sign in range(12)]
+    else:
+        raise ValueError(f"Unsupported varga: D{division}")
+    return np.array(rows, dtype=np.int8)
+
+
+_VARGA_TABLES = {division: build_varga_table(division) for division in SHODASHAVARGAS}
+
+
+def compute_varga_signs(longitudes, divisions=SHODASHAVARGAS):
+    """Map sidereal longitudes of any shape to varga sign indices.
+
+    Returns an int8 array of shape longitudes.shape + (len(divisions),), e.g.
+    (charts, bodies, vargas) for a cohort, with sign indices 0-11.
+    """
+    longitudes = np.asarray(longitudes, dtype=float) % 360.0
+    # x % 360.0 rounds to 360.0 for x just below 0 or 360, so wrap the sign too
+    signs = (longitudes // 30.0).astype(np.intp)
+    deg_in_sign = longitudes - signs * 30.0
+    signs %= 12
+    out = np.empty(longitudes.shape + (len(divisions),), dtype=np.int8)
+    for i, division in enumerate(divisions):
+        table = _VARGA_TABLES.get(division)
+        if table is None:
+            table = _VARGA_TABLES[division] = build_varga_table(division)
+        parts = table.shape[1]
+        part = np.minimum((deg_in_sign * parts / 30.0).astype(np.intp), parts - 1)
+        out[..., i] = table[signs, part]
+    return out